@@ -0,0 +1,53 @@
+"""
+Helpers shared by the Sweed POS scrapers (Green Dragon, Sanctuary).
+"""
+
+SW_PRODUCT_QUERY = b"GetProductByVariantId"
+SCRIPT_END = b"</script>"
+
+
+class SwBlobScanner:
+    """
+    Incremental search of a streamed product page for its JSON blob script.
+
+    ``feed`` each chunk as it arrives. It returns True once the ``<script>``
+    starting at ``marker`` has closed and contains the product query;
+    ``body()`` is then the page up to that ``</script>``. A blob without the
+    product ends the search, and later chunks are only collected so the HTML
+    fallback gets the whole page.
+    """
+
+    def __init__(self, marker: bytes):
+        self._marker = marker
+        self._buf = bytearray()
+        self._marker_at = -1
+        self._scan = 0
+        self._end = -1
+        self._scanning = True
+
+    def feed(self, chunk: bytes) -> bool:
+        buf = self._buf
+        buf += chunk
+        if not self._scanning:
+            return False
+        if self._marker_at < 0:
+            self._marker_at = buf.find(self._marker, self._scan)
+            if self._marker_at < 0:
+                self._scan = max(0, len(buf) - len(self._marker) + 1)
+                return False
+            self._scan = self._marker_at
+        end = buf.find(SCRIPT_END, self._scan)
+        if end < 0:
+            self._scan = max(self._marker_at, len(buf) - len(SCRIPT_END) + 1)
+            return False
+        self._scanning = False
+        if buf.find(SW_PRODUCT_QUERY, self._marker_at, end) < 0:
+            return False
+        self._end = end + len(SCRIPT_END)
+        return True
+
+    def body(self) -> bytes:
+        """The bytes read so far, cut after the blob script once it was found."""
+        if self._end >= 0:
+            return bytes(self._buf[: self._end])
+        return bytes(self._buf)
@@ -7,8 +7,9 @@ Terpene Data: ~85% of products have terpene profiles
 Discovery Date: December 2025
 """
 
+import os
 from typing import TypedDict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 # Type definitions for Menu Downloader compatibility
@@ -66,6 +67,11 @@ class CuraleafConfig:
     rate_limit_ms: int = 500
     max_products_per_store: int = 500
     
+    # Conditional-GET page cache (ETag / Last-Modified revalidation); None = off
+    response_cache_dir: Optional[str] = field(
+        default_factory=lambda: os.environ.get("CURALEAF_CACHE_DIR")
+    )
+    
     # Data selectors (CSS/data-testid)
     selectors: dict = None
     
@@ -11,6 +11,7 @@ Usage:
     products = scraper.scrape_store_menu("curaleaf-dispensary-tampa")
 """
 
+import asyncio
 import httpx
 from bs4 import BeautifulSoup
 import re
@@ -24,6 +25,11 @@ try:
 except ImportError:
     from config import CURALEAF_CONFIG, ProductData, TerpeneData
 
+try:
+    from ...http_cache import get_response_cache
+except ImportError:
+    from terprint_menu_downloader.http_cache import get_response_cache
+
 
 class CuraleafScraper:
     """Scraper for Curaleaf dispensary menus."""
@@ -36,14 +42,43 @@ class CuraleafScraper:
             "Accept-Language": "en-US,en;q=0.9",
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         }
+        cache_dir = getattr(self.config, 'response_cache_dir', None)
+        self._cache = get_response_cache(cache_dir) if cache_dir else None
+    
+    def _request_headers(self, url: str) -> dict:
+        """Default headers plus cached ETag / Last-Modified validators."""
+        if self._cache is None:
+            return self._default_headers
+        return {**self._default_headers, **self._cache.conditional_headers(url)}
+    
+    def _response_text(self, url: str, response: httpx.Response) -> Optional[str]:
+        """Page body for a 200, the cached body on 304, else None."""
+        if response.status_code == 304 and self._cache is not None:
+            body = self._cache.load(url)
+            return body.decode('utf-8', errors='replace') if body is not None else None
+        if response.status_code != 200:
+            return None
+        if self._cache is not None:
+            self._cache.store(url, response.headers, response.content)
+        return response.text
     
     def __enter__(self):
         self.client = httpx.Client(timeout=30.0, follow_redirects=True)
         return self
     
+    @staticmethod
+    def build_async_client(max_connections: int = 10) -> httpx.AsyncClient:
+        """Create an AsyncClient whose connection pool can be shared across stores."""
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        return httpx.AsyncClient(timeout=30.0, follow_redirects=True, limits=limits)
+    
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.client:
             self.client.close()
+            self.client = None
     
     def _parse_aria_label(self, aria: str) -> Optional[dict]:
         """Parse product info from aria-label attribute."""
@@ -93,12 +128,28 @@ class CuraleafScraper:
             raise RuntimeError("Scraper must be used as context manager")
         
         url = self.config.get_menu_url(store_slug)
-        response = self.client.get(url, headers=self._default_headers)
+        response = self.client.get(url, headers=self._request_headers(url))
         
-        if response.status_code != 200:
+        text = self._response_text(url, response)
+        if text is None:
+            raise Exception(f"Failed to fetch menu: {response.status_code}")
+        
+        return self._parse_menu_html(text)
+    
+    async def ascrape_menu_page(self, client: httpx.AsyncClient, store_slug: str) -> list[ProductData]:
+        """Async variant of scrape_menu_page using a caller-owned AsyncClient."""
+        url = self.config.get_menu_url(store_slug)
+        response = await client.get(url, headers=self._request_headers(url))
+        
+        text = self._response_text(url, response)
+        if text is None:
             raise Exception(f"Failed to fetch menu: {response.status_code}")
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return self._parse_menu_html(text)
+    
+    def _parse_menu_html(self, html: str) -> list[ProductData]:
+        """Extract product cards from a menu page (aria-label parsing)."""
+        soup = BeautifulSoup(html, 'html.parser')
         products = []
         
         # Find all product links with aria-label (proven parsing method)
@@ -168,20 +219,40 @@ class CuraleafScraper:
         if not self.client:
             raise RuntimeError("Scraper must be used as context manager")
         
-        terpene_data = {
+        try:
+            response = self.client.get(detail_url, headers=self._request_headers(detail_url))
+            text = self._response_text(detail_url, response)
+            if text is None:
+                return self._empty_terpene_data()
+            return self._parse_terpene_text(text)
+        except Exception:
+            return self._empty_terpene_data()
+    
+    async def ascrape_product_terpenes(self, client: httpx.AsyncClient, detail_url: str) -> dict:
+        """Async variant of scrape_product_terpenes using a caller-owned AsyncClient."""
+        try:
+            response = await client.get(detail_url, headers=self._request_headers(detail_url))
+            text = self._response_text(detail_url, response)
+            if text is None:
+                return self._empty_terpene_data()
+            return self._parse_terpene_text(text)
+        except Exception:
+            return self._empty_terpene_data()
+    
+    @staticmethod
+    def _empty_terpene_data() -> dict:
+        return {
             'total_terpenes_percent': None,
             'top_terpenes': None,
             'terpene_list': [],
             'lab_test_url': None,
         }
+    
+    def _parse_terpene_text(self, text: str) -> dict:
+        """Extract terpene fields from a product detail page body."""
+        terpene_data = self._empty_terpene_data()
         
         try:
-            response = self.client.get(detail_url, headers=self._default_headers)
-            if response.status_code != 200:
-                return terpene_data
-            
-            text = response.text
-            
             # Extract total terpenes from JSON structure
             total_terp_match = re.search(r'"terpenes":\{"value":\[(\d+\.?\d*)\],"unitAbbr":"%"', text)
             if total_terp_match:
@@ -254,6 +325,38 @@ class CuraleafScraper:
         
         return products
     
+    async def ascrape_store_menu_with_terpenes(
+        self,
+        client: httpx.AsyncClient,
+        store_slug: str,
+        max_products: int = None,
+        sample_terpenes: int = None
+    ) -> list[ProductData]:
+        """
+        Async variant of scrape_store_menu_with_terpenes.
+        
+        Detail pages within a store are still fetched one at a time with the
+        configured rate limit; concurrency comes from running several stores
+        on the same client.
+        """
+        products = await self.ascrape_menu_page(client, store_slug)
+        
+        if max_products:
+            products = products[:max_products]
+        
+        terpene_count = sample_terpenes if sample_terpenes else len(products)
+        
+        for i, product in enumerate(products[:terpene_count]):
+            if 'detail_url' in product:
+                terpenes = await self.ascrape_product_terpenes(client, product['detail_url'])
+                product.update(terpenes)
+                
+                # Rate limiting
+                if i < terpene_count - 1:
+                    await asyncio.sleep(self.config.rate_limit_ms / 1000.0)
+        
+        return products
+    
     def scrape_store_to_terprint_format(
         self,
         store_slug: str,
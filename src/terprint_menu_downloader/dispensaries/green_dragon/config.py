@@ -9,7 +9,8 @@ Discovery: green_dragon_prototype_v2.py --validate-slugs
 grower_id: 3
 """
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 
 
@@ -33,6 +34,23 @@ class GreenDragonConfig:
     request_timeout_sec: int = 30
     max_products_per_category: Optional[int] = None  # None = no limit
 
+    # Connection pool, shared by all store workers in the process
+    # (HTTP/2 multiplexes onto one connection when h2 is installed)
+    max_connections: int = 16
+    max_keepalive_connections: int = 8
+    keepalive_expiry_sec: float = 30.0
+
+    # Worker processes for product-page parsing (0 = parse in the calling
+    # thread). Parsing is GIL-bound; processes let parallel stores use cores.
+    parse_processes: int = 0
+
+    # Conditional-GET page cache (ETag / Last-Modified revalidation); None = off.
+    # Over HTTP/2 a product page is cached only up to its window.__sw blob,
+    # or whole when the blob did not parse.
+    response_cache_dir: Optional[str] = field(
+        default_factory=lambda: os.environ.get("GREEN_DRAGON_CACHE_DIR")
+    )
+
     # Platform details
     platform: str = "Sweed POS"
     platform_type: str = "html_scrape"
@@ -60,9 +78,9 @@ class GreenDragonConfig:
         return f"{self.base_url}/{store_slug}/menu/{category_path}/{product_slug}"
 
 
-@dataclass
+@dataclass(frozen=True)
 class StoreConfig:
-    """A single Green Dragon Florida location."""
+    """A single Green Dragon Florida location (immutable and hashable)."""
     slug: str           # Sweed POS slug (e.g., "avon")
     name: str           # Display name (e.g., "Green Dragon - Avon Park")
     city: str           # City name
@@ -72,7 +90,7 @@ class StoreConfig:
 
     def __post_init__(self):
         if not self.url:
-            self.url = f"https://shop.greendragon.com/{self.slug}/menu"
+            object.__setattr__(self, "url", f"https://shop.greendragon.com/{self.slug}/menu")
 
 
 # ---------------------------------------------------------------------------
@@ -124,21 +142,31 @@ def get_fl_stores() -> List[StoreConfig]:
     return FL_STORES
 
 
+# Lookup indexes, built once at import time
+_BY_SLUG: Dict[str, StoreConfig] = {s.slug: s for s in FL_STORES}
+_BY_GD_SLUG: Dict[str, StoreConfig] = {s.gd_slug: s for s in FL_STORES}
+_BY_NAME: Dict[str, StoreConfig] = {s.name: s for s in FL_STORES}
+_BY_CITY: Dict[str, List[StoreConfig]] = {}
+for _store in FL_STORES:
+    _BY_CITY.setdefault(_store.city.casefold(), []).append(_store)
+del _store
+
+
 def get_store_by_slug(slug: str) -> Optional[StoreConfig]:
     """Get a store by its Sweed POS slug."""
-    return next((s for s in FL_STORES if s.slug == slug), None)
+    return _BY_SLUG.get(slug)
 
 
 def get_store_by_gd_slug(slug: str) -> Optional[StoreConfig]:
     """Get a store by its greendragonfl.com slug."""
-    return next((s for s in FL_STORES if s.gd_slug == slug), None)
+    return _BY_GD_SLUG.get(slug)
 
 
 def get_store_by_name(name: str) -> Optional[StoreConfig]:
     """Get a store by its display name."""
-    return next((s for s in FL_STORES if s.name == name), None)
+    return _BY_NAME.get(name)
 
 
 def get_store_by_city(city: str) -> List[StoreConfig]:
     """Get all stores in a specific city."""
-    return [s for s in FL_STORES if s.city.lower() == city.lower()]
+    return list(_BY_CITY.get(city.casefold(), ()))
@@ -25,22 +25,70 @@ import os
 import time
 import logging
 import argparse
-from typing import Optional, List, Dict, Any
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+from bs4 import BeautifulSoup, Tag
 
 try:
     from .config import GREEN_DRAGON_CONFIG, GreenDragonConfig, StoreConfig, FL_CATEGORIES
 except ImportError:
     from config import GREEN_DRAGON_CONFIG, GreenDragonConfig, StoreConfig, FL_CATEGORIES
 
+try:
+    from ...http_cache import ResponseCache, get_response_cache
+except ImportError:
+    from terprint_menu_downloader.http_cache import ResponseCache, get_response_cache
+
+try:
+    from .._sweed import SCRIPT_END, SwBlobScanner
+except ImportError:
+    from terprint_menu_downloader.dispensaries._sweed import SCRIPT_END, SwBlobScanner
+
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional ``h2`` package (httpx[http2]); fall back to HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# orjson parses the embedded Sweed JSON several times faster than stdlib json;
+# its JSONDecodeError subclasses json.JSONDecodeError, so handlers are shared
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# lxml is a C parser, an order of magnitude faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
 
 # ---------------------------------------------------------------------------
 # HTTP helpers
 # ---------------------------------------------------------------------------
 
+# No explicit Accept-Encoding: httpx advertises "gzip, deflate, br, zstd"
+# for exactly the codecs that are importable (httpx[brotli,zstd]), so it never
+# asks for an encoding it can't decode.
 _DEFAULT_HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
@@ -52,24 +100,219 @@ _DEFAULT_HEADERS = {
 }
 
 
-def _get(client: httpx.Client, url: str, rate_limit: float = 1.5) -> Optional[str]:
-    """Fetch a URL, rate-limit before the request, return HTML or None."""
-    time.sleep(rate_limit)
+class _HostRateLimiter:
+    """
+    Monotonic per-host request scheduler.
+
+    Keeps a "next allowed" timestamp per host and only sleeps for whatever is
+    left of the interval since the previous request to that host — time spent
+    downloading and parsing already counts toward the rate limit.
+    """
+
+    def __init__(self):
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str, interval: float) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            next_allowed = self._next.get(host, now)
+            self._next[host] = max(next_allowed, now) + interval
+        delay = next_allowed - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+# One scheduler for the whole process: parallel store scrapes share each
+# host's budget, so adding workers never raises the request rate to a host
+_rate_limiter = _HostRateLimiter()
+
+
+def _rate_limit(url: str, interval: float) -> None:
+    """Block until ``url``'s host may be requested again."""
+    _rate_limiter.wait(url, interval)
+
+
+def _build_client(config: GreenDragonConfig) -> httpx.Client:
+    """Create a keep-alive httpx client (HTTP/2 when available)."""
+    limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry_sec,
+    )
+    return httpx.Client(
+        follow_redirects=True,
+        timeout=config.request_timeout_sec,
+        transport=httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=limits, retries=1),
+    )
+
+
+# Process-wide client: store scrapes (and repeated downloader runs in a
+# long-lived process) reuse pooled connections instead of redoing DNS + TLS
+_shared_client: Optional[httpx.Client] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client(config: GreenDragonConfig = None) -> httpx.Client:
+    """
+    Return the process-wide Green Dragon client, creating it on first use.
+
+    Pool and timeout settings come from the config of the first caller.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None or _shared_client.is_closed:
+            _shared_client = _build_client(config or GREEN_DRAGON_CONFIG)
+        return _shared_client
+
+
+def close_shared_client() -> None:
+    """Close the process-wide client (registered with atexit)."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
+atexit.register(close_shared_client)
+
+
+def warm_shared_client(config: GreenDragonConfig = None, include_coa: bool = False) -> None:
+    """
+    Resolve and connect the shared client before store workers fan out.
+
+    One HEAD per host pays the DNS lookup and TCP/TLS handshake once; the
+    workers then pick up the pooled (HTTP/2: multiplexed) connection
+    instead of each resolving the same hostname. Failures are ignored —
+    workers simply connect on demand.
+    """
+    config = config or GREEN_DRAGON_CONFIG
+    client = get_shared_client(config)
+    urls = [config.base_url]
+    if include_coa:
+        urls.append(f"https://{config.coa_host}")
+    for url in urls:
+        try:
+            client.head(url, headers=_DEFAULT_HEADERS, timeout=config.request_timeout_sec)
+        except httpx.HTTPError as e:
+            logger.debug(f"Connection warm-up failed [{url}]: {e}")
+
+
+def _response_cache(config: GreenDragonConfig) -> Optional[ResponseCache]:
+    """Return the configured page cache, or None when caching is off."""
+    if not config.response_cache_dir:
+        return None
+    return get_response_cache(config.response_cache_dir)
+
+
+_SW_MARKER = b"window.__sw"
+
+
+def _read_until_sw_blob(resp: httpx.Response) -> Tuple[bytes, bool]:
+    """
+    Read a streamed product page only as far as the window.__sw script.
+
+    Returns ``(body, truncated)``. Stops once the ``<script>`` holding the
+    blob has closed and contains the product query, so the rest of the React
+    markup is never downloaded. Reads the whole body when the blob is missing
+    or lacks the product, leaving the HTML fallback a complete page. Only
+    stops early over HTTP/2: there, abandoning the body just resets one
+    stream. Over HTTP/1.1 it would drop the keep-alive connection.
+    """
+    if resp.http_version != "HTTP/2":
+        return resp.read(), False
+
+    scanner = SwBlobScanner(_SW_MARKER)
+    for chunk in resp.iter_bytes():
+        if scanner.feed(chunk):
+            return scanner.body(), True
+    return scanner.body(), False
+
+
+def _fetch_page(
+    client: httpx.Client,
+    url: str,
+    rate_limit: float = 1.5,
+    cache: Optional[ResponseCache] = None,
+    stop_after_sw_blob: bool = False,
+    revalidate: bool = True,
+) -> Tuple[Optional[str], bool]:
+    """
+    ``_get`` that also reports whether the page was cut short after the
+    window.__sw script.
+
+    A truncated body is cached like a whole one, so product pages revalidate
+    too; a 304 serving a stored blob reports it as truncated again.
+    ``revalidate=False`` skips the validators and fetches (and caches) the
+    page again, replacing a stored blob that did not parse.
+    """
+    _rate_limit(url, rate_limit)
+    headers = _DEFAULT_HEADERS
+    if cache is not None and revalidate:
+        headers = {**_DEFAULT_HEADERS, **cache.conditional_headers(url)}
     try:
-        resp = client.get(url, headers=_DEFAULT_HEADERS, follow_redirects=True, timeout=30)
-        resp.raise_for_status()
-        return resp.text
+        with client.stream("GET", url, headers=headers, follow_redirects=True, timeout=30) as resp:
+            if resp.status_code == 304 and cache is not None:
+                body = cache.load(url)
+                if body is not None:
+                    # A stored blob ends at its </script>; a whole page does not
+                    truncated = stop_after_sw_blob and body.endswith(SCRIPT_END)
+                    return body.decode("utf-8", errors="replace"), truncated
+                logger.warning(f"HTTP 304 with no cached body → {url}")
+                return None, False
+            resp.raise_for_status()
+            if stop_after_sw_blob:
+                body, truncated = _read_until_sw_blob(resp)
+            else:
+                body, truncated = resp.read(), False
+            encoding = resp.encoding or "utf-8"
+            response_headers = resp.headers
+        if cache is not None:
+            cache.store(url, response_headers, body)
+        return body.decode(encoding, errors="replace"), truncated
     except httpx.HTTPStatusError as e:
         logger.warning(f"HTTP {e.response.status_code} → {url}")
     except Exception as e:
         logger.warning(f"Request failed [{url}]: {e}")
-    return None
+    return None, False
+
+
+def _get(
+    client: httpx.Client,
+    url: str,
+    rate_limit: float = 1.5,
+    cache: Optional[ResponseCache] = None,
+    stop_after_sw_blob: bool = False,
+) -> Optional[str]:
+    """
+    Fetch a URL, rate-limited per host, return HTML or None.
+
+    With a ``cache``, sends the stored ETag / Last-Modified validators and
+    serves the cached body when the server answers 304 Not Modified.
+    With ``stop_after_sw_blob``, the body is streamed and reading stops
+    after the window.__sw script (see ``_read_until_sw_blob``).
+    """
+    return _fetch_page(client, url, rate_limit, cache, stop_after_sw_blob)[0]
 
 
 # ---------------------------------------------------------------------------
 # Layer 1: Menu listing — extract product links
 # ---------------------------------------------------------------------------
 
+# Trailing Sweed numeric product ID on a slug (e.g., ...-440419)
+_SWEED_ID_RE = re.compile(r"-(\d+)$")
+
+
+@lru_cache(maxsize=256)
+def _product_link_re(store_slug: str, category_path: str) -> "re.Pattern[str]":
+    """Compiled product-link pattern for one store/category menu."""
+    return re.compile(
+        rf"/{re.escape(store_slug)}/menu/{re.escape(category_path)}/([^\s?\"']+)"
+    )
+
+
 def scrape_menu_links(
     client: httpx.Client,
     store_slug: str,
@@ -89,18 +332,16 @@ def scrape_menu_links(
     url = config.get_menu_url(store_slug, category_path)
     logger.info(f"  [{category}] Fetching menu: {url}")
 
-    html = _get(client, url, config.rate_limit_sec)
+    html = _get(client, url, config.rate_limit_sec, _response_cache(config))
     if not html:
         return []
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, _HTML_PARSER)
     products: List[Dict[str, Any]] = []
     seen: set = set()
 
     # Product links: /{store}/menu/{category}-{id}/{slug}
-    url_pattern = re.compile(
-        rf"/{re.escape(store_slug)}/menu/{re.escape(category_path)}/([^\s?\"']+)"
-    )
+    url_pattern = _product_link_re(store_slug, category_path)
 
     for a in soup.find_all("a", href=True):
         href: str = a["href"]
@@ -108,13 +349,14 @@ def scrape_menu_links(
         if not m:
             continue
 
-        product_slug = m.group(1).split("?")[0].rstrip("/")
+        # The pattern already stops at "?", so only a trailing slash remains
+        product_slug = m.group(1).rstrip("/")
         if not product_slug or product_slug in seen:
             continue
         seen.add(product_slug)
 
         # Extract Sweed numeric product ID from end of slug (e.g., ...-440419)
-        id_match = re.search(r"-(\d+)$", product_slug)
+        id_match = _SWEED_ID_RE.search(product_slug)
         sweed_id = id_match.group(1) if id_match else None
 
         product_url = config.get_product_url(store_slug, category_path, product_slug)
@@ -138,6 +380,7 @@ def scrape_product_detail(
     client: httpx.Client,
     product: Dict[str, Any],
     config: GreenDragonConfig = None,
+    scraped_at: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Fetch a Green Dragon product detail page and extract full lab data
@@ -151,45 +394,162 @@ def scrape_product_detail(
         coa_url, batch_id,
         category_name, subcategory, price, weight,
         detail_source (window.__sw | html_fallback | none)
+
+    ``scraped_at`` lets a store scrape stamp every product with one shared
+    ISO timestamp; it defaults to the current UTC time.
     """
     config = config or GREEN_DRAGON_CONFIG
     url = product.get("product_url", "")
     if not url:
         return product
 
-    html = _get(client, url, config.rate_limit_sec)
+    cache = _response_cache(config)
+    html, truncated = _fetch_page(
+        client, url, config.rate_limit_sec, cache, stop_after_sw_blob=True
+    )
     if not html:
         product["detail_error"] = "fetch_failed"
         return product
 
+    variant_id = product.get("sweed_product_id")
+    source, data, error = _parse_product_page_cached(html, variant_id, _get_parse_pool(config))
+    if truncated and source != "window.__sw":
+        # The early stop only pays off when the blob parses; the HTML
+        # fallback needs the whole page. Skip the validators so a 304 cannot
+        # hand back the cached blob, and let the whole page replace it.
+        html, _ = _fetch_page(client, url, config.rate_limit_sec, cache, revalidate=False)
+        if not html:
+            product["detail_error"] = "fetch_failed"
+            return product
+        source, data, error = _parse_product_page_cached(html, variant_id, _get_parse_pool(config))
+    if data:
+        product.update(data)
+    product["detail_source"] = source
+    if error:
+        product["detail_error"] = error
+
+    product["detail_scraped_at"] = scraped_at or datetime.now(timezone.utc).isoformat()
+    return product
+
+
+# Generic page headings captured when a product page 404s or redirects to
+# the category listing (e.g. "All Products") — never real product names
+_BOGUS_NAMES = frozenset({"all products", "menu", "home", "shop", "products"})
+
+
+def _parse_product_page(
+    html: str, variant_id: Optional[str] = None
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse a product page into ``(detail_source, data, detail_error)``.
+
+    Tries the window.__sw JSON blob first, then the rendered HTML.
+    """
     # Primary: window.__sw JSON blob (dehydrated React Query cache)
-    sw_data = _extract_from_sw_blob(html, product.get("sweed_product_id"))
+    sw_data = _extract_from_sw_blob(html, variant_id)
     if sw_data:
-        product.update(sw_data)
-        product["detail_source"] = "window.__sw"
-    else:
-        # Fallback: plain HTML parsing (CSS classes OUIWQpt/zRYKXNN)
-        html_data = _extract_from_html(html)
-        if html_data:
-            # Filter out generic page headings captured when the product page
-            # 404s or redirects to the category listing (e.g. "All Products").
-            _BOGUS_NAMES = {"all products", "menu", "home", "shop", "products"}
-            html_name = (html_data.get("name") or "").strip().lower()
-            if html_name in _BOGUS_NAMES:
-                product["detail_source"] = "none"
-                product["detail_error"] = f"html_fallback_bogus_name:{html_data.get('name')}"
-            else:
-                product.update(html_data)
-                product["detail_source"] = "html_fallback"
-        else:
-            product["detail_source"] = "none"
+        return "window.__sw", sw_data, None
+
+    # Fallback: plain HTML parsing (CSS classes OUIWQpt/zRYKXNN)
+    html_data = _extract_from_html(html)
+    if not html_data:
+        return "none", None, None
+
+    html_name = (html_data.get("name") or "").strip().lower()
+    if html_name in _BOGUS_NAMES:
+        return "none", None, f"html_fallback_bogus_name:{html_data.get('name')}"
+    return "html_fallback", html_data, None
+
+
+class _ParseMemo:
+    """
+    Bounded LRU of product-page parse results, keyed by a digest of the exact
+    page text.
+
+    Pages revalidated through the response cache come back byte-identical,
+    so a long-running process skips re-parsing them. The fingerprint covers
+    the whole page on purpose: two pages that differ only in digits differ
+    in potency or price, and must not share a result.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[bytes, Optional[str]], Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(html: str, variant_id: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        digest = hashlib.blake2b(html.encode("utf-8", errors="replace"), digest_size=16).digest()
+        return digest, variant_id
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
 
-    product["detail_scraped_at"] = datetime.now(timezone.utc).isoformat()
-    return product
+
+_parse_memo = _ParseMemo()
+
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool(config: GreenDragonConfig) -> Optional[ProcessPoolExecutor]:
+    """Return the shared parse process pool, or None when parsing runs inline."""
+    global _parse_pool
+    if config.parse_processes <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=config.parse_processes)
+            atexit.register(_parse_pool.shutdown, wait=False)
+        return _parse_pool
+
+
+def _parse_product_page_cached(
+    html: str,
+    variant_id: Optional[str] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    ``_parse_product_page`` with results memoized per identical page.
+
+    With a ``pool``, the parse runs in a worker process; the calling thread
+    waits without holding the GIL, so other store threads keep fetching.
+    """
+    key = _ParseMemo.key(html, variant_id)
+    entry = _parse_memo.get(key)
+    if entry is not None:
+        source, encoded, error = entry
+        return source, (_json_loads(encoded) if encoded is not None else None), error
+
+    if pool is not None:
+        source, data, error = pool.submit(_parse_product_page, html, variant_id).result()
+    else:
+        source, data, error = _parse_product_page(html, variant_id)
+    # Memoize the data as compact JSON bytes: far smaller than the dict
+    # graph, and decoding hands every caller its own fresh objects to merge
+    # into (and mutate) without a deepcopy.
+    encoded = _json_dumps(data) if data is not None else None
+    _parse_memo.put(key, (source, encoded, error))
+    return source, data, error
 
 
 # ---- window.__sw extraction (Sweed POS — Green Dragon) ----
 
+_SW_BLOB_RE = re.compile(r"window\.__sw\s*=\s*(\{.*?\});\s*</script>", re.DOTALL)
+
+
 def _extract_from_sw_blob(html: str, variant_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Extract product object from window.__sw (React Query cache injected by Sweed POS).
@@ -209,14 +569,18 @@ def _extract_from_sw_blob(html: str, variant_id: Optional[str] = None) -> Option
       }
 
     Extraction strategy (proven in prototype v2):
-      1. Regex-match ``window.__sw = {`` to find the blob start
+      1. Find ``window.__sw = {`` and match the blob from there
       2. Find ``GetProductByVariantId`` query key
       3. Backtrack to nearest ``"state":{"data":{`` before that key
       4. Balanced-brace extraction to get the product JSON object
-      5. json.loads() and normalize
+      5. Parse (orjson when installed) and normalize
     """
-    # Find window.__sw = {...};
-    m = re.search(r"window\.__sw\s*=\s*(\{.*?\});\s*</script>", html, re.DOTALL)
+    # Find window.__sw = {...}; — locate the marker with str.find, then
+    # run the compiled pattern from there instead of from the top of the page
+    pos = html.find("window.__sw")
+    if pos < 0:
+        return None
+    m = _SW_BLOB_RE.search(html, pos)
     if not m:
         return None
 
@@ -255,7 +619,7 @@ def _extract_from_sw_blob(html: str, variant_id: Optional[str] = None) -> Option
     product_json = obj_str[:end]
 
     try:
-        product_data = json.loads(product_json)
+        product_data = _json_loads(product_json)
     except json.JSONDecodeError:
         product_data = _safe_parse_product(product_json)
 
@@ -268,7 +632,7 @@ def _extract_from_sw_blob(html: str, variant_id: Optional[str] = None) -> Option
 def _safe_parse_product(json_str: str) -> Optional[Dict]:
     """Try to parse a product JSON string, handling truncation edge cases."""
     try:
-        return json.loads(json_str)
+        return _json_loads(json_str)
     except json.JSONDecodeError:
         depth = 0
         for i, ch in enumerate(json_str):
@@ -278,7 +642,7 @@ def _safe_parse_product(json_str: str) -> Optional[Dict]:
                 depth -= 1
             if depth == 0 and i > 0:
                 try:
-                    return json.loads(json_str[: i + 1])
+                    return _json_loads(json_str[: i + 1])
                 except json.JSONDecodeError:
                     continue
     return None
@@ -478,6 +842,42 @@ def _normalize_sw_product(data: Dict) -> Dict[str, Any]:
 
 # ---- HTML fallback (when window.__sw is absent) ----
 
+# Link-text keywords that mark a COA anchor, matched in one scan per anchor
+_COA_LINK_TEXT_RE = re.compile(r"coa|lab report|certificate")
+_NUMBER_RE = re.compile(r"([0-9]+\.?[0-9]*)")
+_TOTAL_THC_RE = re.compile(r"Total\s*THC\s*([0-9]+\.?[0-9]*)\s*%", re.IGNORECASE)
+_TOTAL_CBD_RE = re.compile(r"Total\s*CBD\s*([0-9]+\.?[0-9]*)\s*%", re.IGNORECASE)
+_BRAND_RE = re.compile(r"by <!-- -->#<!-- -->([^<]+)")
+_OG_IMAGE_RE = re.compile(r'property="og:image"\s+content="([^"]+)"')
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w\-]")
+
+
+def _label_number(text: str) -> Optional[float]:
+    m = _NUMBER_RE.search(text)
+    return float(m.group(1)) if m else None
+
+
+def _label_tag(text: str) -> str:
+    return text.lstrip("#").strip()
+
+
+# Lab label keyword → (result field, value parser). All keywords are matched
+# by a single compiled alternation per label instead of a chain of substring
+# tests; "strain" only counts as an exact label.
+_LAB_LABELS = {
+    "total thc":         ("thc_percent", _label_number),
+    "total cbd":         ("cbd_percent", _label_number),
+    "total terpenes":    ("total_terpenes_pct", _label_number),
+    "strain prevalence": ("strain_type", _label_tag),
+    "strain":            ("strain_name", _label_tag),
+    "subcategory":       ("subcategory", _label_tag),
+    "total size":        ("weight", str),
+}
+_LAB_LABEL_RE = re.compile(
+    "|".join(rf"^{re.escape(k)}$" if k == "strain" else re.escape(k) for k in _LAB_LABELS)
+)
+
+
 def _extract_from_html(html: str) -> Optional[Dict[str, Any]]:
     """
     Fallback: parse the rendered HTML of a Green Dragon product page.
@@ -488,10 +888,31 @@ def _extract_from_html(html: str) -> Optional[Dict[str, Any]]:
       <div class="zRYKXNN">22.8%</div>
     """
     result: Dict[str, Any] = {}
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, _HTML_PARSER)
+
+    # One walk of the tree collects everything the steps below need: the
+    # first h1/h2, the lab label elements and the anchors with an href.
+    first_h1 = first_h2 = None
+    label_els = []
+    anchors = []
+    for el in soup.descendants:
+        if not isinstance(el, Tag):
+            continue
+        name = el.name
+        if name == "a":
+            if el.has_attr("href"):
+                anchors.append(el)
+        elif name == "h1":
+            if first_h1 is None:
+                first_h1 = el
+        elif name == "h2":
+            if first_h2 is None:
+                first_h2 = el
+        if "OUIWQpt" in el.get("class", ()):
+            label_els.append(el)
 
     # Title
-    title = soup.find("h1") or soup.find("h2")
+    title = first_h1 or first_h2
     if title:
         result["name"] = title.get_text(strip=True)
 
@@ -508,69 +929,53 @@ def _extract_from_html(html: str) -> Optional[Dict[str, Any]]:
                 return val
         return None
 
-    for label_el in soup.find_all(class_="OUIWQpt"):
+    for label_el in label_els:
         label_text = label_el.get_text(strip=True).lower()
+        m = _LAB_LABEL_RE.search(label_text)
+        if m is None:
+            continue
         val_el = _find_value_el(label_el)
         if val_el is None:
             continue
-        val_text = val_el.get_text(strip=True)
-
-        if "total thc" in label_text:
-            m = re.search(r"([0-9]+\.?[0-9]*)", val_text)
-            if m:
-                result["thc_percent"] = float(m.group(1))
-        elif "total cbd" in label_text:
-            m = re.search(r"([0-9]+\.?[0-9]*)", val_text)
-            if m:
-                result["cbd_percent"] = float(m.group(1))
-        elif "total terpenes" in label_text:
-            m = re.search(r"([0-9]+\.?[0-9]*)", val_text)
-            if m:
-                result["total_terpenes_pct"] = float(m.group(1))
-        elif "strain prevalence" in label_text:
-            result["strain_type"] = val_text.lstrip("#").strip()
-        elif label_text == "strain":
-            result["strain_name"] = val_text.lstrip("#").strip()
-        elif "subcategory" in label_text:
-            result["subcategory"] = val_text.lstrip("#").strip()
-        elif "total size" in label_text:
-            result["weight"] = val_text
+
+        field, parse = _LAB_LABELS[m.group(0)]
+        value = parse(val_el.get_text(strip=True))
+        if value is not None:
+            result[field] = value
 
     # ---- Regex fallback for THC/CBD ----
     if "thc_percent" not in result:
-        thc_m = re.search(r"Total\s*THC\s*([0-9]+\.?[0-9]*)\s*%", html, re.IGNORECASE)
+        thc_m = _TOTAL_THC_RE.search(html)
         if thc_m:
             result["thc_percent"] = float(thc_m.group(1))
 
     if "cbd_percent" not in result:
-        cbd_m = re.search(r"Total\s*CBD\s*([0-9]+\.?[0-9]*)\s*%", html, re.IGNORECASE)
+        cbd_m = _TOTAL_CBD_RE.search(html)
         if cbd_m:
             result["cbd_percent"] = float(cbd_m.group(1))
 
     # Brand from "by #BrandName" pattern
-    brand_match = re.search(r"by <!-- -->#<!-- -->([^<]+)", html)
+    brand_match = _BRAND_RE.search(html)
     if brand_match:
         result["brand"] = brand_match.group(1).strip()
 
     # og:image
-    og = re.search(r'property="og:image"\s+content="([^"]+)"', html)
+    og = _OG_IMAGE_RE.search(html)
     if og:
         result["image_url"] = og.group(1)
 
     # ---- COA URL — LabDrive links ----
-    for a in soup.find_all("a", href=True):
-        text = a.get_text(strip=True).lower()
+    for a in anchors:
         href = a["href"]
+        if not href.startswith("http"):
+            continue
         if (
-            "coa" in text
-            or "lab report" in text
-            or "certificate" in text
-            or href.endswith(".pdf")
+            href.endswith(".pdf")
             or "labdrive.net" in href
+            or _COA_LINK_TEXT_RE.search(a.get_text(strip=True).lower())
         ):
-            if href.startswith("http"):
-                result["coa_url"] = href
-                break
+            result["coa_url"] = href
+            break
 
     return result if result.get("name") or result.get("thc_percent") else None
 
@@ -598,7 +1003,7 @@ def download_coa(
     os.makedirs(output_dir, exist_ok=True)
 
     try:
-        time.sleep(rate_limit)
+        _rate_limit(coa_url, rate_limit)
         resp = client.get(coa_url, follow_redirects=True, timeout=30)
         if resp.status_code != 200:
             logger.warning(f"    COA HTTP {resp.status_code}: {coa_url}")
@@ -616,7 +1021,7 @@ def download_coa(
 
         # HTML page — LabDrive landing page with download link
         if "html" in content_type:
-            soup = BeautifulSoup(resp.text, "html.parser")
+            soup = BeautifulSoup(resp.text, _HTML_PARSER)
 
             for a in soup.find_all("a", href=True):
                 href = a["href"]
@@ -666,10 +1071,14 @@ class GreenDragonStoreScraper:
     Usage:
         scraper = GreenDragonStoreScraper()
         result  = scraper.scrape_store(store)
+
+    Requests go through the process-wide client from ``get_shared_client``
+    unless an explicit ``client`` is passed (the caller then owns closing it).
     """
 
-    def __init__(self, config: GreenDragonConfig = None):
+    def __init__(self, config: GreenDragonConfig = None, client: Optional[httpx.Client] = None):
         self.config = config or GREEN_DRAGON_CONFIG
+        self.client = client
 
     def scrape_store(
         self,
@@ -698,47 +1107,59 @@ class GreenDragonStoreScraper:
         categories = categories or FL_CATEGORIES
         all_products: List[Dict[str, Any]] = []
         coa_count = 0
+        now_iso = datetime.now(timezone.utc).isoformat()
 
-        with httpx.Client(follow_redirects=True, timeout=self.config.request_timeout_sec) as client:
-            for category_name, category_path in categories.items():
-                logger.info(f"Store [{store.slug}] - category: {category_name}")
+        client = self.client or get_shared_client(self.config)
+        for category_name, category_path in categories.items():
+            logger.info(f"Store [{store.slug}] - category: {category_name}")
+            # A broken category or product page is recorded and skipped —
+            # it must not take the rest of the store down with it
+            try:
                 products = scrape_menu_links(
                     client, store.slug, category_name, category_path, self.config
                 )
-
-                if include_details:
-                    limit = min(len(products), max_products) if max_products else len(products)
-                    for i in range(limit):
-                        p = products[i]
-                        logger.info(
-                            f"  [{category_name}] Detail {i+1}/{limit}: "
-                            f"{p.get('product_slug', '?')[:50]}"
+            except Exception as e:
+                logger.error(f"Store [{store.slug}] - category {category_name} failed: {e}")
+                continue
+
+            if include_details:
+                limit = min(len(products), max_products) if max_products else len(products)
+                for i in range(limit):
+                    p = products[i]
+                    logger.info(
+                        f"  [{category_name}] Detail {i+1}/{limit}: "
+                        f"{p.get('product_slug', '?')[:50]}"
+                    )
+                    try:
+                        scrape_product_detail(client, p, self.config, now_iso)
+                    except Exception as e:
+                        logger.warning(f"  [{category_name}] Detail failed: {e}")
+                        p["detail_source"] = "none"
+                        p["detail_error"] = repr(e)
+
+            # COA downloads
+            if include_coa and coa_output_dir:
+                coa_dir = os.path.join(coa_output_dir, store.slug)
+                for p in products:
+                    coa_url = p.get("coa_url")
+                    if coa_url:
+                        slug = p.get("product_slug", "unknown")[:80]
+                        safe_name = _UNSAFE_FILENAME_RE.sub("_", slug)
+                        filepath = download_coa(
+                            client, coa_url, coa_dir, safe_name, self.config.rate_limit_sec
                         )
-                        scrape_product_detail(client, p, self.config)
-
-                # COA downloads
-                if include_coa and coa_output_dir:
-                    coa_dir = os.path.join(coa_output_dir, store.slug)
-                    for p in products:
-                        coa_url = p.get("coa_url")
-                        if coa_url:
-                            slug = p.get("product_slug", "unknown")[:80]
-                            safe_name = re.sub(r"[^\w\-]", "_", slug)
-                            filepath = download_coa(
-                                client, coa_url, coa_dir, safe_name, self.config.rate_limit_sec
-                            )
-                            if filepath:
-                                p["coa_file"] = filepath
-                                p["coa_downloaded"] = True
-                                coa_count += 1
-                            else:
-                                p["coa_downloaded"] = False
-
-                all_products.extend(products)
-
-                if max_products and len(all_products) >= max_products:
-                    logger.info(f"  Reached max_products={max_products}, stopping.")
-                    break
+                        if filepath:
+                            p["coa_file"] = filepath
+                            p["coa_downloaded"] = True
+                            coa_count += 1
+                        else:
+                            p["coa_downloaded"] = False
+
+            all_products.extend(products)
+
+            if max_products and len(all_products) >= max_products:
+                logger.info(f"  Reached max_products={max_products}, stopping.")
+                break
 
         return {
             "dispensary":    "green_dragon",
@@ -748,7 +1169,7 @@ class GreenDragonStoreScraper:
             "state":         store.state,
             "products":      all_products,
             "product_count": len(all_products),
-            "timestamp":     datetime.now(timezone.utc).isoformat(),
+            "timestamp":     now_iso,
             "metadata": {
                 "platform":           self.config.platform,
                 "platform_type":      self.config.platform_type,
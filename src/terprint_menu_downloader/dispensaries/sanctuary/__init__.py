@@ -4,22 +4,26 @@ from .config import (
     SANCTUARY_CONFIG,
     FL_STORES,
     FL_CATEGORIES,
+    MENU_URLS,
     SanctuaryConfig,
     SanctuaryStore,
     get_fl_stores,
     get_store_by_slug,
     get_store_by_name,
     get_store_by_city,
+    menu_url_of,
 )
 
 __all__ = [
     "SANCTUARY_CONFIG",
     "FL_STORES",
     "FL_CATEGORIES",
+    "MENU_URLS",
     "SanctuaryConfig",
     "SanctuaryStore",
     "get_fl_stores",
     "get_store_by_slug",
     "get_store_by_name",
     "get_store_by_city",
+    "menu_url_of",
 ]
@@ -9,7 +9,7 @@ grower_id: 9
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, NamedTuple, Tuple
 
 
 @dataclass
@@ -26,9 +26,22 @@ class SanctuaryConfig:
     vaporizers_path: str = "vaporizers-1386"
 
     # Scraping settings
-    rate_limit_sec: float = 1.5       # seconds between requests
+    # The async scraper spaces request starts rate_limit_sec /
+    # concurrent_requests apart: up to concurrent_requests / rate_limit_sec
+    # requests per second to the host (serial: 1 / rate_limit_sec)
+    rate_limit_sec: float = 1.5
+    concurrent_requests: int = 4      # product pages fetched in parallel
     request_timeout_sec: int = 30
     max_products_per_category: Optional[int] = None  # None = no limit
+    connect_timeout_sec: float = 5.0
+
+    # Connection pool for the store's AsyncClient
+    # (HTTP/2 multiplexes onto one connection when h2 is installed)
+    http2: bool = True
+    max_connections: int = 8
+    max_keepalive_connections: int = 4
+    keepalive_expiry_sec: float = 60.0
+    transport_retries: int = 2        # connect-level retries only
 
     # COA / Lab data  
     coa_link_text: str = "COA  Lab Report Link"
@@ -56,9 +69,8 @@ class SanctuaryConfig:
         return f"{self.shop_base}/{store_slug}/product/{product_slug}"
 
 
-@dataclass
-class SanctuaryStore:
-    """A single Sanctuary Florida location."""
+class SanctuaryStore(NamedTuple):
+    """A single Sanctuary Florida location (immutable, hashable, no per-instance __dict__)."""
     slug: str          # URL slug (e.g., "orlando")
     name: str          # Display name (e.g., "Sanctuary - Orlando I Drive")
     city: str          # City name
@@ -107,6 +119,13 @@ FL_CATEGORIES: Dict[str, str] = {
 # Singleton config
 SANCTUARY_CONFIG = SanctuaryConfig()
 
+# Menu URLs for every (store slug, category name), formatted once at import
+MENU_URLS: Dict[Tuple[str, str], str] = {
+    (s.slug, cat_name): SANCTUARY_CONFIG.get_menu_url(s.slug, path)
+    for s in FL_STORES
+    for cat_name, path in FL_CATEGORIES.items()
+}
+
 
 # ---------------------------------------------------------------------------
 # Helper functions
@@ -116,13 +135,27 @@ def get_fl_stores() -> List[SanctuaryStore]:
     return FL_STORES
 
 
+def menu_url_of(slug: str, category: str) -> str:
+    """Return the precomputed menu URL for a store slug and category name."""
+    return MENU_URLS[(slug, category)]
+
+
+# Lookup indexes, built once at import time
+_BY_SLUG: Dict[str, SanctuaryStore] = {s.slug: s for s in FL_STORES}
+_BY_NAME: Dict[str, SanctuaryStore] = {s.name: s for s in FL_STORES}
+_BY_CITY: Dict[str, List[SanctuaryStore]] = {}
+for _store in FL_STORES:
+    _BY_CITY.setdefault(_store.city.casefold(), []).append(_store)
+del _store
+
+
 def get_store_by_slug(slug: str) -> Optional[SanctuaryStore]:
-    return next((s for s in FL_STORES if s.slug == slug), None)
+    return _BY_SLUG.get(slug)
 
 
 def get_store_by_name(name: str) -> Optional[SanctuaryStore]:
-    return next((s for s in FL_STORES if s.name == name), None)
+    return _BY_NAME.get(name)
 
 
 def get_store_by_city(city: str) -> List[SanctuaryStore]:
-    return [s for s in FL_STORES if s.city.lower() == city.lower()]
+    return list(_BY_CITY.get(city.casefold(), ()))
@@ -17,21 +17,69 @@ Usage (standalone test):
 
 import httpx
 import re
+import asyncio
 import json
 import time
 import logging
 import argparse
-from typing import Optional, List, Dict, Any, Tuple
+from functools import lru_cache
+from io import BytesIO
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 
 try:
-    from .config import SANCTUARY_CONFIG, SanctuaryConfig, SanctuaryStore, FL_CATEGORIES
+    from .config import SANCTUARY_CONFIG, SanctuaryConfig, SanctuaryStore, FL_CATEGORIES, MENU_URLS
 except ImportError:
-    from config import SANCTUARY_CONFIG, SanctuaryConfig, SanctuaryStore, FL_CATEGORIES
+    from config import SANCTUARY_CONFIG, SanctuaryConfig, SanctuaryStore, FL_CATEGORIES, MENU_URLS
+
+try:
+    from .._sweed import SwBlobScanner
+except ImportError:
+    from terprint_menu_downloader.dispensaries._sweed import SwBlobScanner
 
 logger = logging.getLogger(__name__)
 
+# requestx is a Rust-backed, API-compatible httpx replacement with much lower
+# per-request overhead; use it when installed and fall back to httpx
+try:
+    import requestx as httpx_impl
+    if not all(hasattr(httpx_impl, a) for a in ("Client", "AsyncClient", "AsyncHTTPTransport", "Limits", "Timeout", "HTTPStatusError")):
+        raise ImportError("requestx lacks the httpx client API")
+    REQUESTX_AVAILABLE = True
+except ImportError:
+    httpx_impl = httpx
+    REQUESTX_AVAILABLE = False
+
+# orjson parses the embedded Sweed JSON several times faster than stdlib json;
+# its JSONDecodeError subclasses json.JSONDecodeError, so handlers are shared
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# HTTP/2 needs the optional ``h2`` package (httpx[http2]); fall back to HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# selectolax (lexbor, C) pulls hrefs out of a menu page several times faster
+# than building a parse tree; fall back to streaming lxml without it
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# lxml is a core dependency: a C parser, an order of magnitude faster than
+# the pure-Python html.parser
+from lxml import etree as _etree
+
+_HTML_PARSER = "lxml"
+
 
 # ---------------------------------------------------------------------------
 # HTTP helpers
@@ -55,17 +103,137 @@ def _get(client: httpx.Client, url: str, rate_limit: float = 1.5) -> Optional[st
         resp = client.get(url, headers=_DEFAULT_HEADERS, follow_redirects=True, timeout=30)
         resp.raise_for_status()
         return resp.text
-    except httpx.HTTPStatusError as e:
+    except httpx_impl.HTTPStatusError as e:
         logger.warning(f"HTTP {e.response.status_code} → {url}")
     except Exception as e:
         logger.warning(f"Request failed [{url}]: {e}")
     return None
 
 
+def _build_async_client(config: SanctuaryConfig) -> httpx.AsyncClient:
+    """Create a keep-alive AsyncClient (HTTP/2 when available and enabled)."""
+    limits = httpx_impl.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry_sec,
+    )
+    return httpx_impl.AsyncClient(
+        follow_redirects=True,
+        timeout=httpx_impl.Timeout(config.request_timeout_sec, connect=config.connect_timeout_sec),
+        transport=httpx_impl.AsyncHTTPTransport(
+            http2=config.http2 and HTTP2_AVAILABLE,
+            limits=limits,
+            retries=config.transport_retries,
+        ),
+    )
+
+
+class _AsyncRateLimiter:
+    """Space request start times at least ``interval`` seconds apart."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+                now = self._next_at
+            self._next_at = now + self.interval
+
+
+_SW_QC_MARKER = b"window.__sw_qc"
+
+
+async def _aread_until_sw_blob(resp: httpx.Response) -> Tuple[bytes, bool]:
+    """
+    Async ``_read_until_sw_blob`` (green_dragon) for the window.__sw_qc script.
+
+    Returns ``(body, truncated)``; stops early only over HTTP/2 and only once
+    the blob script has closed holding the product query.
+    """
+    if resp.http_version != "HTTP/2":
+        return await resp.aread(), False
+
+    scanner = SwBlobScanner(_SW_QC_MARKER)
+    async for chunk in resp.aiter_bytes():
+        if scanner.feed(chunk):
+            return scanner.body(), True
+    return scanner.body(), False
+
+
+async def _afetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    limiter: Optional[_AsyncRateLimiter] = None,
+    stop_after_sw_blob: bool = False,
+) -> Tuple[Optional[str], bool]:
+    """``_aget`` that also reports whether the page was cut short after the blob."""
+    if limiter is not None:
+        await limiter.wait()
+    try:
+        async with client.stream(
+            "GET", url, headers=_DEFAULT_HEADERS, follow_redirects=True
+        ) as resp:
+            resp.raise_for_status()
+            if stop_after_sw_blob:
+                body, truncated = await _aread_until_sw_blob(resp)
+            else:
+                body, truncated = await resp.aread(), False
+            encoding = resp.encoding or "utf-8"
+        return body.decode(encoding, errors="replace"), truncated
+    except httpx_impl.HTTPStatusError as e:
+        logger.warning(f"HTTP {e.response.status_code} → {url}")
+    except Exception as e:
+        logger.warning(f"Request failed [{url}]: {e}")
+    return None, False
+
+
+async def _aget(
+    client: httpx.AsyncClient,
+    url: str,
+    limiter: Optional[_AsyncRateLimiter] = None,
+    stop_after_sw_blob: bool = False,
+) -> Optional[str]:
+    """
+    Async ``_get``: wait for the rate limiter, then fetch and return HTML or None.
+
+    With ``stop_after_sw_blob``, the body is streamed and reading stops
+    after the window.__sw_qc script (see ``_aread_until_sw_blob``).
+    """
+    return (await _afetch_page(client, url, limiter, stop_after_sw_blob))[0]
+
+
 # ---------------------------------------------------------------------------
 # Layer 1: Menu listing — extract product links
 # ---------------------------------------------------------------------------
 
+def _iter_hrefs(html: str) -> Iterator[str]:
+    """Yield the href of every ``<a href>`` in a page."""
+    if SELECTOLAX_AVAILABLE:
+        for node in _FastHTMLParser(html).css("a[href]"):
+            href = node.attributes.get("href")
+            if href:
+                yield href
+    else:
+        # Stream anchor end-events and drop each one (and its finished
+        # siblings) as we go, so the tree never holds the whole page
+        context = _etree.iterparse(
+            BytesIO(html.encode("utf-8")), events=("end",), tag="a", html=True, encoding="utf-8"
+        )
+        for _, a in context:
+            href = a.get("href")
+            if href:
+                yield href
+            a.clear()
+            while a.getprevious() is not None:
+                del a.getparent()[0]
+
+
 def scrape_menu_links(
     client: httpx.Client,
     store_slug: str,
@@ -84,62 +252,87 @@ def scrape_menu_links(
     Returns list of dicts with: product_slug, product_url, category, sweed_product_id
     """
     config = config or SANCTUARY_CONFIG
-    url = config.get_menu_url(store_slug, category_path)
+    url = _menu_url(store_slug, category, category_path, config)
     logger.info(f"  [{category}] Fetching menu: {url}")
 
     html = _get(client, url, config.rate_limit_sec)
     if not html:
         return []
+    return parse_menu_links(html, store_slug, category)
+
+
+async def scrape_menu_links_async(
+    client: httpx.AsyncClient,
+    store_slug: str,
+    category: str,
+    category_path: str,
+    config: SanctuaryConfig = None,
+    limiter: Optional[_AsyncRateLimiter] = None,
+) -> List[Dict[str, Any]]:
+    """Async ``scrape_menu_links``."""
+    config = config or SANCTUARY_CONFIG
+    url = _menu_url(store_slug, category, category_path, config)
+    logger.info(f"  [{category}] Fetching menu: {url}")
+
+    html = await _aget(client, url, limiter)
+    if not html:
+        return []
+    return parse_menu_links(html, store_slug, category)
 
-    soup = BeautifulSoup(html, "html.parser")
+
+def _menu_url(store_slug: str, category: str, category_path: str, config: SanctuaryConfig) -> str:
+    url = None
+    if config is SANCTUARY_CONFIG and FL_CATEGORIES.get(category) == category_path:
+        url = MENU_URLS.get((store_slug, category))
+    return url or config.get_menu_url(store_slug, category_path)
+
+
+@lru_cache(maxsize=64)
+def _product_href_re(store_slug: str) -> "re.Pattern[str]":
+    """Compiled product-link pattern for one store; captures path, slug and Sweed ID."""
+    return re.compile(
+        rf"^(?:https://sanctuarymed\.com)?"
+        rf"(?P<path>/shop/florida/{re.escape(store_slug)}/(?:product|menu/[^/?#]+)/"
+        rf"(?P<slug>[^/?#]+?(?:-(?P<id>\d+))?))/?(?:[?#]|$)"
+    )
+
+
+@lru_cache(maxsize=64)
+def _store_href_prefixes(store_slug: str) -> Tuple[str, str]:
+    """Relative and absolute href prefixes of one store's shop pages."""
+    shop_prefix = f"/shop/florida/{store_slug}/"
+    return shop_prefix, f"https://sanctuarymed.com{shop_prefix}"
+
+
+def parse_menu_links(html: str, store_slug: str, category: str) -> List[Dict[str, Any]]:
+    """Extract this store's product links from a fetched category menu page."""
     products: List[Dict[str, Any]] = []
     seen: set = set()
 
-    # Patterns that match Sweed POS product links on sanctuarymed.com
-    shop_prefix = f"/shop/florida/{store_slug}/"
+    prefixes = _store_href_prefixes(store_slug)
+    href_re = _product_href_re(store_slug)
 
-    for a in soup.find_all("a", href=True):
-        href: str = a["href"]
+    for href in _iter_hrefs(html):
+        # Most anchors (nav, footer, other stores) fail this single C call
+        if not href.startswith(prefixes):
+            continue
 
-        # Must be a product link for this store
-        if not href.startswith(shop_prefix) and not href.startswith(f"https://sanctuarymed.com/shop/florida/{store_slug}/"):
+        # Must be a product link for this store:
+        #   /shop/florida/{store}/product/{slug}
+        #   /shop/florida/{store}/menu/{category-id}/{slug}
+        # Not /menu, /menu/discounts, /about-us ...
+        m = href_re.match(href)
+        if not m:
             continue
 
-        # Normalise to path only
-        path = href.replace(f"https://sanctuarymed.com", "")
-
-        # Must reference either /product/ or a specific category menu item
-        # Valid: /product/{slug}  or  /menu/{category-id}/{slug}
-        # Invalid: /menu  /menu/discounts  /about-us ...
-        if "/product/" not in path:
-            # For menu paths, require it's under a category sub-path (2+ segments after /menu/)
-            menu_idx = path.find("/menu/")
-            if menu_idx == -1:
-                continue
-            after_menu = path[menu_idx + len("/menu/"):]
-            # Must have at least one / after the category (i.e., /menu/{cat}/{slug})
-            if "/" not in after_menu:
-                continue
-
-        # Derive product slug (last path segment, strip query string)
-        product_slug = path.split("/")[-1].split("?")[0].rstrip("/")
-        if not product_slug or product_slug in seen:
+        path, product_slug, sweed_id = m.group("path", "slug", "id")
+        if product_slug in seen:
             continue
         seen.add(product_slug)
 
-        # Build absolute product detail URL — preserve the exact href Sweed gave us
+        # Absolute product detail URL, keeping the path Sweed gave us
         # (Sanctuary uses /menu/{category}/{slug}, NOT /product/{slug})
-        if href.startswith("http"):
-            product_url = path  # already absolute, strip domain
-            product_url = f"https://sanctuarymed.com{product_url}" if product_url.startswith("/") else href
-        else:
-            # Strip query string for cleaner URL but keep the full path
-            clean_path = path.split("?")[0]
-            product_url = f"https://sanctuarymed.com{clean_path}"
-
-        # Extract Sweed numeric product ID from end of slug (e.g., blue-dream-440419)
-        id_match = re.search(r"-(\d+)$", product_slug)
-        sweed_id = id_match.group(1) if id_match else None
+        product_url = f"https://sanctuarymed.com{path}"
 
         products.append({
             "product_slug":     product_slug,
@@ -160,6 +353,7 @@ def scrape_product_detail(
     client: httpx.Client,
     product: Dict[str, Any],
     config: SanctuaryConfig = None,
+    scraped_at: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Fetch a Sanctuary product detail page and extract full lab data
@@ -173,6 +367,9 @@ def scrape_product_detail(
         coa_url, batch_id,
         category_name, subcategory, price, weight,
         detail_source (window.__sw | html_fallback | none)
+
+    ``scraped_at`` lets a store scrape stamp every product with one shared
+    ISO timestamp; it defaults to the current UTC time.
     """
     config = config or SANCTUARY_CONFIG
     url = product.get("product_url", "")
@@ -183,6 +380,52 @@ def scrape_product_detail(
     if not html:
         product["detail_error"] = "fetch_failed"
         return product
+    return _apply_product_detail(product, html, scraped_at=scraped_at)
+
+
+async def scrape_product_detail_async(
+    client: httpx.AsyncClient,
+    product: Dict[str, Any],
+    config: SanctuaryConfig = None,
+    limiter: Optional[_AsyncRateLimiter] = None,
+    scraped_at: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Async ``scrape_product_detail``."""
+    url = product.get("product_url", "")
+    if not url:
+        return product
+
+    html, truncated = await _afetch_page(client, url, limiter, stop_after_sw_blob=True)
+    if html and truncated:
+        detail = _apply_product_detail(dict(product), html, scraped_at=scraped_at)
+        if detail.get("detail_source") == "window.__sw":
+            product.update(detail)
+            return product
+        # The early stop only pays off when the blob parses; the HTML
+        # fallback needs the whole page
+        html = await _aget(client, url, limiter)
+    if not html:
+        product["detail_error"] = "fetch_failed"
+        return product
+    return _apply_product_detail(product, html, scraped_at=scraped_at)
+
+
+def _apply_product_detail(
+    product: Dict[str, Any],
+    html: str,
+    scraped_at: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Parse a fetched product page into ``product``.
+
+    The page is only turned into a soup if the JSON blob is missing.
+    """
+    # Stub pages (200 OK "product unavailable") have neither the JSON blob
+    # nor any lab data — two substring scans spare them both parsers
+    if "window.__sw" not in html and "Total THC" not in html:
+        product["detail_source"] = "none"
+        product["detail_scraped_at"] = scraped_at or datetime.now(timezone.utc).isoformat()
+        return product
 
     # Primary: window.__sw JSON blob
     sw_data = _extract_from_sw_blob(html, product.get("sweed_product_id"))
@@ -198,7 +441,7 @@ def scrape_product_detail(
         else:
             product["detail_source"] = "none"
 
-    product["detail_scraped_at"] = datetime.now(timezone.utc).isoformat()
+    product["detail_scraped_at"] = scraped_at or datetime.now(timezone.utc).isoformat()
     return product
 
 
@@ -206,6 +449,39 @@ def scrape_product_detail(
 
 # ---- window.__sw_qc extraction (Sweed POS — Sanctuary) ----
 
+# Matched at the offset just past the variable name, never scanned
+_ASSIGN_RE = re.compile(r"\s*=\s*\{")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _find_assignment(html: str, var: str) -> Optional[int]:
+    """Return the offset of the ``{`` assigned to ``var`` in ``html``, or None."""
+    pos = html.find(var)
+    while pos != -1:
+        m = _ASSIGN_RE.match(html, pos + len(var))
+        if m:
+            return m.end() - 1
+        pos = html.find(var, pos + 1)
+    return None
+
+
+def _decode_assigned_object(html: str, start: int) -> Any:
+    """
+    Decode the JSON object literal starting at ``html[start]``.
+
+    The blob is normally the whole rest of its <script>, so that slice goes
+    to the fast loader; anything else after the object falls back to
+    raw_decode, which stops at the end of the literal by itself.
+    """
+    end = html.find("</script>", start)
+    if end != -1:
+        try:
+            return _json_loads(html[start:end].rstrip().rstrip(";"))
+        except json.JSONDecodeError:
+            pass
+    return _JSON_DECODER.raw_decode(html, start)[0]
+
+
 def _extract_from_sw_blob(html: str, variant_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Extract product object from window.__sw_qc (React Query cache injected by Sweed POS).
@@ -239,34 +515,17 @@ def _extract_from_sw_blob(html: str, variant_id: Optional[str] = None) -> Option
       }
     """
     # Sanctuary uses window.__sw_qc for the React Query cache
-    m = re.search(r"window\.__sw_qc\s*=\s*(\{)", html)
-    if not m:
+    var = "window.__sw_qc"
+    start = _find_assignment(html, var)
+    if start is None:
         # Fallback: try legacy window.__sw with dehydratedState
-        m = re.search(r"window\.__sw\s*=\s*(\{)", html)
-        if not m:
-            return None
         var = "window.__sw"
-    else:
-        var = "window.__sw_qc"
-
-    start = m.start(1)
-    raw = html[start:]
-    depth = 0
-    end = 0
-    for i, ch in enumerate(raw):
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-        if depth == 0 and i > 0:
-            end = i + 1
-            break
-
-    if not end:
-        return None
+        start = _find_assignment(html, var)
+        if start is None:
+            return None
 
     try:
-        qc_data = json.loads(raw[:end])
+        qc_data = _decode_assigned_object(html, start)
     except json.JSONDecodeError as e:
         logger.debug(f"JSON decode error in {var}: {e}")
         return None
@@ -288,16 +547,6 @@ def _extract_from_sw_blob(html: str, variant_id: Optional[str] = None) -> Option
     return None
 
 
-def _try_partial_parse(s: str) -> Optional[Dict]:
-    """Last-resort: try to salvage a truncated JSON object."""
-    for i in range(len(s), 0, -100):
-        try:
-            return json.loads(s[:i] + "}" * s[:i].count("{") - s[:i].count("}") * "}")
-        except Exception:
-            continue
-    return None
-
-
 def _normalize_sw_product(data: Dict) -> Dict[str, Any]:
     """Normalize Sweed POS product JSON (GetProductByVariantId) into Terprint standard format.
 
@@ -438,6 +687,35 @@ def _normalize_sw_product(data: Dict) -> Dict[str, Any]:
 
 # ---- HTML fallback (when window.__sw is absent) ----
 
+_NUMBER_RE = re.compile(r"([0-9]+\.?[0-9]*)")
+_TOTAL_THC_RE = re.compile(r"Total\s*THC\s*([0-9]+\.?[0-9]*)\s*%", re.IGNORECASE)
+_TOTAL_CBD_RE = re.compile(r"Total\s*CBD\s*([0-9]+\.?[0-9]*)\s*%", re.IGNORECASE)
+
+
+def _label_number(text: str) -> Optional[float]:
+    m = _NUMBER_RE.search(text)
+    return float(m.group(1)) if m else None
+
+
+def _label_tag(text: str) -> str:
+    # Value is like "#Indica" or "Indica"
+    return text.lstrip("#").strip()
+
+
+# Lab label keyword → (result field, value parser), matched by one compiled
+# alternation per label; "strain" only counts as an exact label.
+_LAB_LABELS = {
+    "total thc":         ("thc_percent", _label_number),
+    "total cbd":         ("cbd_percent", _label_number),
+    "total terpenes":    ("total_terpenes_pct", _label_number),
+    "strain prevalence": ("strain_type", _label_tag),
+    "strain":            ("strain_name", _label_tag),
+}
+_LAB_LABEL_RE = re.compile(
+    "|".join(rf"^{re.escape(k)}$" if k == "strain" else re.escape(k) for k in _LAB_LABELS)
+)
+
+
 def _extract_from_html(html: str) -> Optional[Dict[str, Any]]:
     """
     Fallback: parse the rendered HTML of a Sanctuary product page.
@@ -452,7 +730,7 @@ def _extract_from_html(html: str) -> Optional[Dict[str, Any]]:
     Confident Cannabis COA PDF.
     """
     result: Dict[str, Any] = {}
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, _HTML_PARSER)
 
     # Title
     title = soup.find("h1") or soup.find("h2")
@@ -478,40 +756,29 @@ def _extract_from_html(html: str) -> Optional[Dict[str, Any]]:
 
     for label_el in soup.find_all(class_="OUIWQpt"):
         label_text = label_el.get_text(strip=True).lower()
+        m = _LAB_LABEL_RE.search(label_text)
+        if m is None:
+            continue
         val_el = _find_value_el(label_el)
         if val_el is None:
             continue
-        val_text = val_el.get_text(strip=True)
-
-        if "total thc" in label_text:
-            m = re.search(r"([0-9]+\.?[0-9]*)", val_text)
-            if m:
-                result["thc_percent"] = float(m.group(1))
-        elif "total cbd" in label_text:
-            m = re.search(r"([0-9]+\.?[0-9]*)", val_text)
-            if m:
-                result["cbd_percent"] = float(m.group(1))
-        elif "total terpenes" in label_text:
-            m = re.search(r"([0-9]+\.?[0-9]*)", val_text)
-            if m:
-                result["total_terpenes_pct"] = float(m.group(1))
-        elif "strain prevalence" in label_text:
-            # Value is like "#Indica" or "Indica"
-            result["strain_type"] = val_text.lstrip("#").strip()
-        elif label_text == "strain":
-            result["strain_name"] = val_text.lstrip("#").strip()
+
+        field, parse = _LAB_LABELS[m.group(0)]
+        value = parse(val_el.get_text(strip=True))
+        if value is not None:
+            result[field] = value
 
     # ---- Regex fallback for THC/CBD if CSS classes not found ----
     # Sanctuary renders "Total THC29.5%" in some contexts (label/value sibling
     # text gets concatenated).  The regex below handles both:
     #   "Total THC 29.5%" and "Total THC29.5%"
     if "thc_percent" not in result:
-        thc_m = re.search(r"Total\s*THC\s*([0-9]+\.?[0-9]*)\s*%", html, re.IGNORECASE)
+        thc_m = _TOTAL_THC_RE.search(html)
         if thc_m:
             result["thc_percent"] = float(thc_m.group(1))
 
     if "cbd_percent" not in result:
-        cbd_m = re.search(r"Total\s*CBD\s*([0-9]+\.?[0-9]*)\s*%", html, re.IGNORECASE)
+        cbd_m = _TOTAL_CBD_RE.search(html)
         if cbd_m:
             result["cbd_percent"] = float(cbd_m.group(1))
 
@@ -575,32 +842,93 @@ class SanctuaryStoreScraper:
                 "metadata":       {...},
             }
         """
+        coro = self.ascrape_store(store, categories, include_details, max_products)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Called from inside an event loop — run ours on a private thread
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+    async def ascrape_store(
+        self,
+        store: SanctuaryStore,
+        categories: Optional[Dict[str, str]] = None,
+        include_details: bool = True,
+        max_products: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async ``scrape_store``.
+
+        All category menus are fetched first, then every product page; both
+        run up to ``config.concurrent_requests`` at a time, with request
+        starts spaced ``rate_limit_sec / concurrent_requests`` apart. The
+        host therefore sees up to ``concurrent_requests / rate_limit_sec``
+        requests per second (4 / 1.5 s by default), ``concurrent_requests``
+        times the serial scraper's rate.
+        """
         categories = categories or FL_CATEGORIES
         all_products: List[Dict[str, Any]] = []
-
-        with httpx.Client(follow_redirects=True, timeout=self.config.request_timeout_sec) as client:
-            for category_name, category_path in categories.items():
+        seen_urls: Dict[str, Dict[str, Any]] = {}
+        now_iso = datetime.now(timezone.utc).isoformat()
+        concurrency = max(1, self.config.concurrent_requests)
+        limiter = _AsyncRateLimiter(self.config.rate_limit_sec / concurrency)
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _menu(client: httpx.AsyncClient, category_name: str, category_path: str):
+            async with sem:
                 logger.info(f"Store [{store.slug}] - category: {category_name}")
-                products = scrape_menu_links(
-                    client, store.slug, category_name, category_path, self.config
+                return await scrape_menu_links_async(
+                    client, store.slug, category_name, category_path, self.config, limiter
                 )
 
+        async def _detail(client: httpx.AsyncClient, category_name: str, p: Dict[str, Any]) -> None:
+            async with sem:
+                logger.info(f"  [{category_name}] Detail: {p.get('product_slug', '?')}")
+                try:
+                    await scrape_product_detail_async(client, p, self.config, limiter, now_iso)
+                except Exception as e:
+                    logger.warning(f"  [{category_name}] Detail failed [{p.get('product_url')}]: {e}")
+                    p["detail_source"] = "none"
+                    p["detail_error"] = repr(e)
+
+        async with _build_async_client(self.config) as client:
+            # Category menus are independent pages — fetch them together
+            menus = await asyncio.gather(*(
+                _menu(client, category_name, category_path)
+                for category_name, category_path in categories.items()
+            ))
+
+            todo: List[Tuple[str, Dict[str, Any]]] = []
+            for category_name, products in zip(categories, menus):
+                # A product listed under several categories is fetched once;
+                # later categories are recorded on the first copy
+                fresh: List[Dict[str, Any]] = []
+                for p in products:
+                    first = seen_urls.get(p["product_url"])
+                    if first is None:
+                        p["categories"] = [category_name]
+                        seen_urls[p["product_url"]] = p
+                        fresh.append(p)
+                    elif category_name not in first["categories"]:
+                        first["categories"].append(category_name)
+
                 if include_details:
-                    for i, p in enumerate(products):
-                        if max_products and len(all_products) + i >= max_products:
-                            break
-                        logger.info(
-                            f"  [{category_name}] Detail {i+1}/{len(products)}: "
-                            f"{p.get('product_slug', '?')}"
-                        )
-                        scrape_product_detail(client, p, self.config)
+                    room = fresh
+                    if max_products:
+                        room = fresh[:max(0, max_products - len(all_products))]
+                    todo.extend((category_name, p) for p in room)
 
-                all_products.extend(products)
+                all_products.extend(fresh)
 
                 if max_products and len(all_products) >= max_products:
                     logger.info(f"  Reached max_products={max_products}, stopping.")
                     break
 
+            await asyncio.gather(*(_detail(client, category_name, p) for category_name, p in todo))
+
         return {
             "dispensary":    "sanctuary",
             "store_slug":    store.slug,
@@ -609,7 +937,7 @@ class SanctuaryStoreScraper:
             "state":         store.state,
             "products":      all_products,
             "product_count": len(all_products),
-            "timestamp":     datetime.now(timezone.utc).isoformat(),
+            "timestamp":     now_iso,
             "metadata": {
                 "platform":           self.config.platform,
                 "platform_type":      self.config.platform_type,
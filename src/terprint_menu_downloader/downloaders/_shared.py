@@ -0,0 +1,143 @@
+"""
+Helpers shared by the dispensary downloaders: JSON encoding, atomic file
+writes and store distances.
+"""
+import json
+import math
+import os
+import tempfile
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# orjson parses and encodes several times faster than stdlib json and works
+# on UTF-8 bytes directly; fall back to stdlib json with the same contract
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+# NumPy computes every store distance in one vectorized pass; fall back to
+# scalar math without it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+EARTH_RADIUS_MILES = 3959
+
+# Joins the texts of a search index; never part of a batch ID or SKU
+SEARCH_SEPARATOR = "\x01"
+
+
+def encode_with_size(payload: Dict[str, Any], indent: bool = False) -> bytes:
+    """Encode payload once and record the encoded length as its
+    raw_response_size; the field describes those bytes, so it is not in them."""
+    payload.pop("raw_response_size", None)
+    encoded = json_dumps(payload, indent=indent)
+    payload["raw_response_size"] = len(encoded)
+    return encoded
+
+
+def write_atomic(filepath: str, payload: bytes) -> None:
+    """Write an encoded payload in one write() and swap it into place.
+
+    Readers see either the previous file or the complete new one, never a
+    partial dump.
+    """
+    # A unique temp file per call, so concurrent writers of the same path
+    # never clobber each other's data
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or ".", suffix=".tmp")
+    try:
+        # A payload larger than the buffer goes straight to a single write()
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def haversine_miles(lat: float, lng: float, coords: List[Tuple[float, float]]) -> List[float]:
+    """Great-circle distances in miles from (lat, lng) to each (lat, lng) in coords"""
+    if NUMPY_AVAILABLE:
+        pts = np.radians(np.asarray(coords, dtype=np.float64))
+        lat1, lng1 = math.radians(lat), math.radians(lng)
+        dlat = pts[:, 0] - lat1
+        dlng = pts[:, 1] - lng1
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(pts[:, 0]) * np.sin(dlng / 2) ** 2
+        return (EARTH_RADIUS_MILES * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))).tolist()
+
+    distances = []
+    for lat2, lng2 in coords:
+        dlat = math.radians(lat2 - lat)
+        dlng = math.radians(lng2 - lng)
+        a = (math.sin(dlat / 2) ** 2
+             + math.cos(math.radians(lat)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2)
+        distances.append(EARTH_RADIUS_MILES * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+    return distances
+
+
+def build_search_index(texts: List[str]) -> Tuple[str, List[int]]:
+    """
+    Join search texts with SEARCH_SEPARATOR and record each one's start
+    offset, so one str.find locates the first text containing a needle.
+    """
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+    return SEARCH_SEPARATOR.join(texts), starts
+
+
+def search_first(index: Tuple[str, List[int]], needle: str) -> Optional[int]:
+    """Position of the first text of a build_search_index index containing needle"""
+    joined, starts = index
+    if not starts:
+        return None
+    if SEARCH_SEPARATOR in needle:
+        # Such a needle could match across two texts; test each on its own
+        ends = starts[1:] + [len(joined) + 1]
+        for position, (start, end) in enumerate(zip(starts, ends)):
+            if needle in joined[start:end - 1]:
+                return position
+        return None
+    at = joined.find(needle)
+    if at < 0:
+        return None
+    return bisect_right(starts, at) - 1
+
+
+def index_products(
+    products: List[Dict], batch_and_sku: Callable[[Dict], Tuple[str, str]]
+) -> Tuple[str, List[int]]:
+    """
+    Search index over the lowercased batch ID and SKU of each product;
+    ``batch_and_sku`` reads the two fields from one dispensary's products.
+    """
+    texts = []
+    for product in products:
+        batch, sku = batch_and_sku(product)
+        # The NUL keeps a match from spanning the batch/SKU boundary
+        texts.append(f"{batch}\x00{sku}".lower())
+    return build_search_index(texts)
+
+
+def find_product(
+    products: List[Dict], index: Optional[Tuple[str, List[int]]], batch_id: str
+) -> Optional[Dict]:
+    """First product whose batch ID or SKU contains batch_id (any case)"""
+    position = search_first(index, batch_id.lower()) if index else None
+    return products[position] if position is not None else None
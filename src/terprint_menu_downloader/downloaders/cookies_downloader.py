@@ -2,21 +2,51 @@
 Cookies Florida Downloader Module
 Downloads menu data from all Cookies Florida locations
 """
-import json
+import asyncio
+import logging
 import os
+import httpx
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
+try:
+    from ..http_cache import ResponseCache, get_response_cache
+except ImportError:
+    from terprint_menu_downloader.http_cache import ResponseCache, get_response_cache
+
+try:
+    from ._shared import find_product, index_products, json_dumps, json_loads, write_atomic
+except ImportError:
+    from terprint_menu_downloader.downloaders._shared import (
+        find_product, index_products, json_dumps, json_loads, write_atomic
+    )
+
+logger = logging.getLogger(__name__)
+
+# Locations fetched at once; the bound is the only politeness throttle
+DEFAULT_PARALLEL_LOCATIONS = 6
+
 
 class CookiesDownloader:
     """Download menu data from Cookies Florida dispensaries"""
     
-    def __init__(self, output_dir: str = "downloads", azure_manager=None):
+    def __init__(self, output_dir: str = "downloads", azure_manager=None,
+                 parallel: int = DEFAULT_PARALLEL_LOCATIONS,
+                 response_cache_dir: Optional[str] = None):
         self.output_dir = output_dir
         self.azure_manager = azure_manager
+        self.parallel = parallel
+        
+        # Conditional-GET cache (ETag / Last-Modified revalidation); None = off
+        cache_dir = response_cache_dir or os.environ.get("COOKIES_CACHE_DIR")
+        self._cache: Optional[ResponseCache] = get_response_cache(cache_dir) if cache_dir else None
         
         # Cookies Florida product category slugs (Dovetail API)
         # Discovered from API probing 2025-06-19
@@ -46,70 +76,143 @@ class CookiesDownloader:
             "pensacola", "port-charlotte", "port-st-lucie", "sanford",
             "tampa", "tampa-fletcher"
         ]
+        
+        # Per-location API URLs and display names, built once
+        self._api_urls = {s: self.api_template.format(slug=s) for s in self.location_slugs}
+        self._display_names = {s: f"Cookies {s.replace('-', ' ').title()}" for s in self.location_slugs}
+        
+        # Keep-alive session for the sync path (download_location /
+        # get_stock_status): one TLS handshake instead of one per location,
+        # with backoff on throttling and transient server errors
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"GET"}))
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        
+        # Per-location stock index, reused by get_stock_status calls in the
+        # same wall-clock minute (the minute bucket is part of the key)
+        self._cached_location_index = lru_cache(maxsize=32)(self._build_location_index)
+    
+    def _api_url(self, location_slug: str) -> str:
+        return self._api_urls.get(location_slug) or self.api_template.format(slug=location_slug)
+    
+    def _display_name(self, location_slug: str) -> str:
+        return (self._display_names.get(location_slug)
+                or f"Cookies {location_slug.replace('-', ' ').title()}")
+    
+    def _request_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers for a cached URL (empty without a cache)"""
+        return self._cache.conditional_headers(url) if self._cache is not None else {}
+    
+    def _response_body(self, url: str, response) -> bytes:
+        """Body of a 200, or the cached body on 304; caches fresh validators"""
+        if response.status_code == 304 and self._cache is not None:
+            body = self._cache.load(url)
+            if body is None:
+                raise ValueError(f"HTTP 304 with no cached body for {url}")
+            return body
+        response.raise_for_status()
+        if self._cache is not None:
+            self._cache.store(url, response.headers, response.content)
+        return response.content
+    
+    def close(self):
+        """Close the pooled HTTP session"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def download_location(self, location_slug: str) -> Optional[Dict]:
         """Download menu data for a specific location"""
         try:
-            api_url = self.api_template.format(slug=location_slug)
-            response = requests.get(api_url, timeout=30)
-            response.raise_for_status()
+            api_url = self._api_url(location_slug)
+            response = self._session.get(api_url, headers=self._request_headers(api_url), timeout=30)
             
-            menu_data = response.json()
-            
-            # Extract product count from API response
-            if isinstance(menu_data, dict) and 'results' in menu_data:
-                product_count = len(menu_data.get('results', []))
-            elif isinstance(menu_data, list):
-                product_count = len(menu_data)
-            else:
-                product_count = 0
-            
-            result = {
-                "location": location_slug,
-                "download_timestamp": datetime.now().isoformat(),
-                "api_url": api_url,
-                "product_count": product_count,
-                "products": menu_data
-            }
-            
-            return result
+            # Parse the raw body bytes — no text decode before the JSON parse
+            menu_data = json_loads(self._response_body(api_url, response))
+            return self._build_result(location_slug, api_url, menu_data)
             
         except Exception as e:
-            print(f"Error downloading {location_slug}: {e}")
+            logger.error("Error downloading %s: %s", location_slug, e)
+            return None
+
+    async def download_location_async(self, client: httpx.AsyncClient, location_slug: str,
+                                      sem: asyncio.Semaphore) -> Optional[Dict]:
+        """Async ``download_location`` on a shared client, bounded by ``sem``"""
+        try:
+            api_url = self._api_url(location_slug)
+            async with sem:
+                response = await client.get(api_url, headers=self._request_headers(api_url))
+            body = self._response_body(api_url, response)
+            return self._build_result(location_slug, api_url, json_loads(body))
+        except Exception as e:
+            logger.error("Error downloading %s: %s", location_slug, e)
             return None
+
+    def _build_result(self, location_slug: str, api_url: str, menu_data) -> Dict:
+        """Wrap one location's API response in the download envelope"""
+        # Extract product count from API response
+        if isinstance(menu_data, dict) and 'results' in menu_data:
+            product_count = len(menu_data.get('results', []))
+        elif isinstance(menu_data, list):
+            product_count = len(menu_data)
+        else:
+            product_count = 0
+        
+        return {
+            "location": location_slug,
+            "download_timestamp": datetime.now().isoformat(),
+            "api_url": api_url,
+            "product_count": product_count,
+            "products": menu_data
+        }
+
+    async def _download_locations_async(self) -> List[Optional[Dict]]:
+        """Fetch every location concurrently; results follow location_slugs order"""
+        sem = asyncio.Semaphore(self.parallel)
+        limits = httpx.Limits(max_connections=self.parallel, max_keepalive_connections=self.parallel)
+        async with httpx.AsyncClient(timeout=30, limits=limits, follow_redirects=True) as client:
+            return await asyncio.gather(*(
+                self.download_location_async(client, slug, sem) for slug in self.location_slugs
+            ))
+
+    def _download_locations(self) -> List[Optional[Dict]]:
+        """Sync entry to ``_download_locations_async`` (safe inside a running loop)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._download_locations_async())
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self._download_locations_async()).result()
     
     def download_all(self) -> Dict[str, List]:
         """Download menu data from all Cookies Florida locations"""
-        print(f"\n{'='*60}")
-        print(f"COOKIES FLORIDA - Starting download from {len(self.location_slugs)} locations")
-        print(f"{'='*60}\n")
+        logger.info("=" * 60)
+        logger.info("COOKIES FLORIDA - Starting download from %d locations", len(self.location_slugs))
+        logger.info("=" * 60)
         
         results = []
         successful = 0
         failed = 0
         
-        for location_slug in self.location_slugs:
-            print(f"Downloading {location_slug}...", end=" ")
-            
-            result = self.download_location(location_slug)
-            
+        for location_slug, result in zip(self.location_slugs, self._download_locations()):
             if result:
                 # Save individual location file
                 filename = f"cookies_{location_slug}_menu_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
                 filepath = os.path.join(self.cookies_dir, filename)
                 
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
+                write_atomic(filepath, json_dumps(result, indent=True))
                 
-                print(f"✓ {result['product_count']} products")
+                logger.info("%s: ✓ %d products", location_slug, result['product_count'])
                 results.append(result)
                 successful += 1
             else:
-                print(f"✗ Failed")
+                logger.warning("%s: ✗ Failed", location_slug)
                 failed += 1
-            
-            # Be nice to the server
-            time.sleep(1)
         
         # Save combined results
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -123,15 +226,14 @@ class CookiesDownloader:
             "locations": results
         }
         
-        with open(combined_file, 'w', encoding='utf-8') as f:
-            json.dump(combined_data, f, indent=2, ensure_ascii=False)
+        write_atomic(combined_file, json_dumps(combined_data, indent=True))
         
-        print(f"\n{'='*60}")
-        print(f"COOKIES FLORIDA - Download Complete")
-        print(f"Successful: {successful}/{len(self.location_slugs)}")
-        print(f"Failed: {failed}")
-        print(f"Combined file: {combined_file}")
-        print(f"{'='*60}\n")
+        logger.info("=" * 60)
+        logger.info("COOKIES FLORIDA - Download Complete")
+        logger.info("Successful: %d/%d", successful, len(self.location_slugs))
+        logger.info("Failed: %d", failed)
+        logger.info("Combined file: %s", combined_file)
+        logger.info("=" * 60)
         
         return {
             'cookies': results
@@ -139,25 +241,24 @@ class CookiesDownloader:
     
     def download(self) -> List:
         """Download method called by orchestrator - returns list of tuples (filename, data)"""
-        print(f"\n{'='*60}")
-        print(f"COOKIES FLORIDA - Starting download from {len(self.location_slugs)} locations")
-        print(f"{'='*60}\n")
+        logger.info("=" * 60)
+        logger.info("COOKIES FLORIDA - Starting download from %d locations", len(self.location_slugs))
+        logger.info("=" * 60)
         
         results = []
         
-        for location_slug in self.location_slugs:
-            print(f"   Downloading {location_slug}...", end=" ")
-            
-            result = self.download_location(location_slug)
-            
+        # One timestamp and date folder for every file in this run
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        date_folder = now.strftime("%Y/%m/%d")
+        
+        for location_slug, result in zip(self.location_slugs, self._download_locations()):
             if result:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"cookies_{location_slug}_menu_{timestamp}.json"
                 
                 # Save to Azure Data Lake if available
                 if self.azure_manager:
                     try:
-                        date_folder = datetime.now().strftime("%Y/%m/%d")
                         azure_path = f"dispensaries/cookies/{date_folder}/{filename}"
                         
                         success = self.azure_manager.save_json_to_data_lake(
@@ -168,37 +269,65 @@ class CookiesDownloader:
                         
                         if success:
                             filepath = f"azure://{azure_path}"
-                            print(f"✓ {result['product_count']} products saved to Azure")
+                            logger.info("%s: ✓ %d products saved to Azure",
+                                        location_slug, result['product_count'])
                             results.append((filepath, result))
                         else:
-                            print(f"✗ Failed to save to Azure")
+                            logger.error("%s: ✗ Failed to save to Azure", location_slug)
                     except Exception as azure_error:
-                        print(f"✗ Azure save error: {azure_error}")
+                        logger.error("%s: ✗ Azure save error: %s", location_slug, azure_error)
                 else:
-                    print(f"✗ Azure Data Lake Manager not available")
+                    logger.error("%s: ✗ Azure Data Lake Manager not available", location_slug)
             else:
-                print(f"✗ Failed to download")
-            
-            # Be nice to the server
-            time.sleep(1)
+                logger.warning("%s: ✗ Failed to download", location_slug)
         
-        print(f"\n{'='*60}")
-        print(f"COOKIES FLORIDA - Download Complete")
-        print(f"Total files saved to Azure: {len(results)}")
-        print(f"{'='*60}\n")
+        logger.info("=" * 60)
+        logger.info("COOKIES FLORIDA - Download Complete")
+        logger.info("Total files saved to Azure: %d", len(results))
+        logger.info("=" * 60)
         
         return results
     
     def get_latest_download(self) -> Optional[str]:
         """Get the path to the most recent combined download file"""
-        downloads = [f for f in os.listdir(self.output_dir) 
-                    if f.startswith('cookies_downloads_') and f.endswith('.json')]
+        # Filenames embed a sortable timestamp, so the latest is the max name
+        with os.scandir(self.output_dir) as entries:
+            latest = max(
+                (e.name for e in entries
+                 if e.name.startswith('cookies_downloads_') and e.name.endswith('.json')),
+                default=None
+            )
+        return os.path.join(self.output_dir, latest) if latest else None
+    
+    def _build_location_index(self, location_slug: str, minute_bucket: int) -> Tuple[Tuple[str, List[int]], List[Dict]]:
+        """
+        Download a location and index its products' batch ID and SKU text.
         
-        if not downloads:
-            return None
+        Returns (index, products). Raises LookupError when the download fails,
+        so failures are never cached.
+        """
+        result = self.download_location(location_slug)
+        if not result:
+            raise LookupError(location_slug)
+        
+        products = result.get('products', {})
+        # Handle both list and dict responses
+        if isinstance(products, dict):
+            products = products.get('results', [])
         
-        downloads.sort(reverse=True)
-        return os.path.join(self.output_dir, downloads[0])
+        return index_products(products, self._batch_and_sku), products
+    
+    def _location_index(self, location_slug: str) -> Optional[Tuple[Tuple[str, List[int]], List[Dict]]]:
+        """Cached ``_build_location_index`` for the current minute, or None if the download failed"""
+        try:
+            return self._cached_location_index(location_slug, int(time.time() // 60))
+        except LookupError:
+            return None
+    
+    @staticmethod
+    def _batch_and_sku(product: Dict) -> Tuple[str, str]:
+        """Batch ID and SKU of a Cookies product, as searched by get_stock_status"""
+        return product.get('batch_id') or product.get('batch') or '', product.get('sku') or ''
     
     def get_stock_status(self, batch_id: str, store_id: str = None, 
                          user_lat: float = None, user_lng: float = None,
@@ -209,95 +338,58 @@ class CookiesDownloader:
         Args:
             batch_id: Batch ID to check stock for
             store_id: Optional specific store slug to check
-            user_lat: Optional user latitude for distance calculations
-            user_lng: Optional user longitude for distance calculations
-            max_distance: Optional maximum distance in miles
+            user_lat: Unused; Cookies locations carry no coordinates
+            user_lng: Unused; Cookies locations carry no coordinates
+            max_distance: Unused; Cookies locations carry no coordinates
             
         Returns:
             Dict with stock status, stores carrying the product, and summary
         """
-        import math
-        
-        def calculate_distance(lat1, lng1, lat2, lng2):
-            """Calculate distance in miles between two coordinates"""
-            R = 3959  # Earth's radius in miles
-            lat1_rad = math.radians(lat1)
-            lat2_rad = math.radians(lat2)
-            dlat = math.radians(lat2 - lat1)
-            dlng = math.radians(lng2 - lng1)
-            a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng/2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-            return R * c
-        
         try:
             locations_to_check = [store_id] if store_id else self.location_slugs
             in_stock_stores = []
             out_of_stock_stores = []
             product_name = None
             
-            for slug in locations_to_check:
-                try:
-                    result = self.download_location(slug)
-                    if not result:
-                        out_of_stock_stores.append({'store_id': slug, 'in_stock': False})
-                        continue
-                    
-                    products = result.get('products', {})
-                    # Handle both list and dict responses
-                    if isinstance(products, dict):
-                        products = products.get('results', [])
-                    
-                    # Search for batch_id in products
-                    found = False
-                    for product in products:
-                        prod_batch = str(product.get('batch_id', '') or product.get('batch', '') or '')
-                        prod_sku = str(product.get('sku', '') or '')
+            # Locations are independent requests — fetch them in parallel and
+            # scan the results here, in location order
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(locations_to_check)))) as ex:
+                indexes = ex.map(self._location_index, locations_to_check)
+                for slug, entry in zip(locations_to_check, indexes):
+                    try:
+                        if not entry:
+                            out_of_stock_stores.append({'store_id': slug, 'in_stock': False})
+                            continue
                         
-                        if batch_id.lower() in prod_batch.lower() or batch_id.lower() in prod_sku.lower():
-                            found = True
-                            if not product_name:
-                                product_name = product.get('name', product.get('title', 'Unknown'))
-                            
-                            store_info = {
-                                'store_id': slug,
-                                'store_name': f"Cookies {slug.replace('-', ' ').title()}",
-                                'in_stock': True,
-                                'price': product.get('price'),
-                                'quantity_available': product.get('quantity'),
-                                'location': {
-                                    'address': None,
-                                    'lat': None,
-                                    'lng': None
-                                },
-                                'distance_miles': None
-                            }
-                            
-                            # Calculate distance if available
-                            if user_lat and user_lng and store_info['location']['lat']:
-                                store_info['distance_miles'] = calculate_distance(
-                                    user_lat, user_lng,
-                                    store_info['location']['lat'], 
-                                    store_info['location']['lng']
-                                )
-                                if max_distance and store_info['distance_miles'] > max_distance:
-                                    continue
-                            
-                            in_stock_stores.append(store_info)
-                            break
-                    
-                    if not found:
-                        out_of_stock_stores.append({'store_id': slug, 'in_stock': False})
+                        # First product whose batch/SKU contains the query
+                        index, products = entry
+                        product = find_product(products, index, batch_id)
+                        if product is None:
+                            out_of_stock_stores.append({'store_id': slug, 'in_stock': False})
+                            continue
                         
-                except Exception as e:
-                    print(f"Error checking store {slug}: {e}")
-                    continue
-                
-                # Rate limit
-                time.sleep(0.5)
-            
-            # Sort by distance if available
-            if user_lat and user_lng:
-                in_stock_stores.sort(key=lambda s: s.get('distance_miles') or float('inf'))
+                        if not product_name:
+                            product_name = product.get('name', product.get('title', 'Unknown'))
+                        
+                        store_info = {
+                            'store_id': slug,
+                            'store_name': self._display_name(slug),
+                            'in_stock': True,
+                            'price': product.get('price'),
+                            'quantity_available': product.get('quantity'),
+                            'location': {
+                                'address': None,
+                                'lat': None,
+                                'lng': None
+                            },
+                            'distance_miles': None
+                        }
+                        
+                        in_stock_stores.append(store_info)
+                        
+                    except Exception as e:
+                        logger.warning("Error checking store %s: %s", slug, e)
+                        continue
             
             return {
                 'batch_id': batch_id,
@@ -9,24 +9,32 @@ Terpene Data: ~85% of products have terpene profiles
 Supports batching for Azure Functions timeout constraints:
 - store_batch: Which batch of stores to download (0-based index)
 - stores_per_batch: Number of stores per batch (default 15)
-- parallel_stores: Number of stores to download in parallel (default 3)
+- parallel_stores: Number of stores to download concurrently (default 3)
+- parallel_uploads: Number of Azure uploads in flight at once (default 4)
 """
 import asyncio
-import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+try:
+    from ._shared import encode_with_size, write_atomic
+except ImportError:
+    from terprint_menu_downloader.downloaders._shared import encode_with_size, write_atomic
+
+
 # Detect if running as package
 _RUNNING_AS_PACKAGE = "terprint_menu_downloader" in __name__
 
 # Default batching configuration
 DEFAULT_STORES_PER_BATCH = 15  # ~3-4 min per batch with parallel downloads
-DEFAULT_PARALLEL_STORES = 3   # Download 3 stores simultaneously
+DEFAULT_PARALLEL_STORES = 3   # Concurrent stores on one shared async connection pool
+DEFAULT_PARALLEL_UPLOADS = 4  # Azure uploads in flight, independent of scraping
 
 
 class CuraleafDownloader:
@@ -42,7 +50,8 @@ class CuraleafDownloader:
         max_products_per_store: int = None,
         store_batch: int = None,
         stores_per_batch: int = DEFAULT_STORES_PER_BATCH,
-        parallel_stores: int = DEFAULT_PARALLEL_STORES
+        parallel_stores: int = DEFAULT_PARALLEL_STORES,
+        parallel_uploads: int = DEFAULT_PARALLEL_UPLOADS
     ):
         self.output_dir = output_dir
         self.azure_manager = azure_manager
@@ -53,6 +62,10 @@ class CuraleafDownloader:
         self.store_batch = store_batch  # None = all stores, 0/1/2/3 = specific batch
         self.stores_per_batch = stores_per_batch
         self.parallel_stores = parallel_stores
+        # Uploads run off the event loop after a store's scrape slot is
+        # released; this bounds them separately so they can't swamp the
+        # Azure SDK pool while scrapes keep going
+        self._upload_sem = threading.Semaphore(max(1, parallel_uploads))
         
         # Import config package from dispensaries folder
         if _RUNNING_AS_PACKAGE:
@@ -65,6 +78,10 @@ class CuraleafDownloader:
         self.config = CURALEAF_CONFIG
         self.all_stores = FL_STORES
         self.scraper_class = CuraleafScraper
+        # One scraper for the whole run: its sync client is opened once in
+        # download(), and the async path only uses its parsing/config
+        self._scraper = CuraleafScraper()
+        self._stores_by_slug = {s['slug']: s for s in self.all_stores}
         
         # Calculate which stores to download based on batch
         self.stores = self._get_batch_stores()
@@ -96,80 +113,165 @@ class CuraleafDownloader:
         """Return the total number of stores across all batches."""
         return len(self.all_stores)
 
-    def download_location(self, store_slug: str, store_name: str = None) -> Optional[Dict]:
+    def download_location(
+        self, store_slug: str, store_name: str = None, now_iso: str = None
+    ) -> Optional[Dict]:
         """
         Download menu data for a specific store.
         
         Args:
             store_slug: Store slug (e.g., "curaleaf-dispensary-tampa")
             store_name: Optional display name for the store
+            now_iso: Run timestamp shared by every store (default: now, UTC)
             
         Returns:
             Dict with store data or None if failed
         """
         try:
-            # Get store info from config - check all_stores since stores may be filtered
-            store_info = next((s for s in self.all_stores if s['slug'] == store_slug), {})
+            # Get store info from config - look up all_stores since stores may be filtered
+            store_info = self._stores_by_slug.get(store_slug, {})
             display_name = store_name or store_info.get('name', store_slug)
             
-            # Use the scraper from config package
-            with self.scraper_class() as scraper:
-                products = scraper.scrape_store_menu_with_terpenes(
+            # Reuse the run's open scraper; standalone calls open their own
+            if self._scraper.client is not None:
+                products = self._scraper.scrape_store_menu_with_terpenes(
                     store_slug,
                     max_products=self.max_products_per_store,
                     sample_terpenes=None  # Get all terpenes
                 )
+            else:
+                with self.scraper_class() as scraper:
+                    products = scraper.scrape_store_menu_with_terpenes(
+                        store_slug,
+                        max_products=self.max_products_per_store,
+                        sample_terpenes=None  # Get all terpenes
+                    )
 
-            return {
-                "dispensary": "curaleaf",
-                "store_slug": store_slug,
-                "store_name": display_name,
-                "store_id": store_info.get('unique_id', store_slug),
-                "state": "FL",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "download_time": datetime.now(timezone.utc).isoformat(),
-                "product_count": len(products),
-                "products": products,
-                "metadata": {
-                    "platform": self.config.platform,
-                    "platform_type": self.config.platform_type,
-                    "terpene_source": self.config.terpene_source,
-                    "downloader_version": "1.1",  # Updated for batching support
-                    "batch": self.store_batch,
-                    "stores_per_batch": self.stores_per_batch,
-                }
-            }
+            return self._build_result(store_slug, display_name, store_info, products, now_iso)
         except Exception as e:
             logger.error(f"Error downloading {store_slug}: {e}")
             return None
 
-    def _download_store_with_save(self, store: Dict) -> Optional[Tuple[str, Dict]]:
-        """Download a single store and save to Azure/local. Thread-safe for parallel execution."""
+    async def download_location_async(
+        self, client, store_slug: str, store_name: str = None, now_iso: str = None
+    ) -> Optional[Dict]:
+        """Async variant of download_location on a shared httpx.AsyncClient."""
+        try:
+            store_info = self._stores_by_slug.get(store_slug, {})
+            display_name = store_name or store_info.get('name', store_slug)
+
+            products = await self._scraper.ascrape_store_menu_with_terpenes(
+                client,
+                store_slug,
+                max_products=self.max_products_per_store,
+                sample_terpenes=None  # Get all terpenes
+            )
+
+            return self._build_result(store_slug, display_name, store_info, products, now_iso)
+        except Exception as e:
+            logger.error(f"Error downloading {store_slug}: {e}")
+            return None
+
+    def _build_result(
+        self, store_slug: str, display_name: str, store_info: Dict, products: List[Dict],
+        now_iso: str = None
+    ) -> Dict:
+        """Wrap scraped products in the per-store payload."""
+        now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+        return {
+            "dispensary": "curaleaf",
+            "store_slug": store_slug,
+            "store_name": display_name,
+            "store_id": store_info.get('unique_id', store_slug),
+            "state": "FL",
+            "timestamp": now_iso,
+            "download_time": now_iso,
+            "product_count": len(products),
+            "products": products,
+            "metadata": {
+                "platform": self.config.platform,
+                "platform_type": self.config.platform_type,
+                "terpene_source": self.config.terpene_source,
+                "downloader_version": "1.1",  # Updated for batching support
+                "batch": self.store_batch,
+                "stores_per_batch": self.stores_per_batch,
+            }
+        }
+
+    def _download_store_with_save(
+        self, store: Dict, run_ts: str = None, date_folder: str = None, now_iso: str = None
+    ) -> Optional[Tuple[str, Dict]]:
+        """Download a single store and save to Azure/local. Thread-safe for parallel execution.
+        
+        ``run_ts`` / ``date_folder`` / ``now_iso`` let one run share a single filename
+        timestamp, Azure date folder and payload timestamp; all default to the current time.
+        """
+        try:
+            result = self.download_location(store['slug'], store['name'], now_iso)
+        except Exception as e:
+            logger.error(f"✗ {store['name']}: Error: {e}")
+            return None
+        return self._save_result(store, result, run_ts, date_folder)
+
+    async def _download_store_async(
+        self, store: Dict, client, sem: asyncio.Semaphore,
+        run_ts: str = None, date_folder: str = None, now_iso: str = None
+    ) -> Optional[Tuple[str, Dict]]:
+        """Scrape one store on the shared client, then save it off the event loop."""
+        try:
+            async with sem:
+                result = await self.download_location_async(
+                    client, store['slug'], store['name'], now_iso
+                )
+        except Exception as e:
+            logger.error(f"✗ {store['name']}: Error: {e}")
+            return None
+        # Azure SDK and file writes block; keep them off the loop
+        return await asyncio.to_thread(self._save_result, store, result, run_ts, date_folder)
+
+    async def _download_all_async(
+        self, run_ts: str = None, date_folder: str = None, now_iso: str = None
+    ) -> List[Optional[Tuple[str, Dict]]]:
+        """Download every batch store concurrently over one connection pool."""
+        sem = asyncio.Semaphore(self.parallel_stores)
+        async with self.scraper_class.build_async_client(self.parallel_stores) as client:
+            return await asyncio.gather(*[
+                self._download_store_async(store, client, sem, run_ts, date_folder, now_iso)
+                for store in self.stores
+            ])
+
+    def _run_async_download(
+        self, run_ts: str, date_folder: str, now_iso: str
+    ) -> List[Optional[Tuple[str, Dict]]]:
+        coro = self._download_all_async(run_ts, date_folder, now_iso)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Already inside an event loop (e.g. async Azure Function host)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+    def _save_result(
+        self, store: Dict, result: Optional[Dict], run_ts: str = None, date_folder: str = None
+    ) -> Optional[Tuple[str, Dict]]:
+        """Save a downloaded store result to Azure/local. Thread-safe."""
         store_slug = store['slug']
         store_name = store['name']
         
         try:
-            result = self.download_location(store_slug, store_name)
-            
             if result and result.get('product_count', 0) > 0:
                 # Create filename with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = run_ts or datetime.now().strftime("%Y%m%d_%H%M%S")
                 filename = f"curaleaf_products_store_{store_slug}_{timestamp}.json"
                 
-                # Add raw response size for tracking
-                result['raw_response_size'] = len(json.dumps(result))
-                
                 # Save to Azure Data Lake if available
                 if self.azure_manager:
                     try:
-                        date_folder = datetime.now().strftime("%Y/%m/%d")
-                        azure_path = f"dispensaries/curaleaf/{date_folder}/{filename}"
+                        folder = date_folder or datetime.now().strftime("%Y/%m/%d")
+                        azure_path = f"dispensaries/curaleaf/{folder}/{filename}"
                         
-                        success = self.azure_manager.save_json_to_data_lake(
-                            json_data=result,
-                            file_path=azure_path,
-                            overwrite=True
-                        )
+                        success = self._upload(result, azure_path)
                         
                         if success:
                             logger.info(f"✓ {store_name}: {result['product_count']} products")
@@ -185,8 +287,7 @@ class CuraleafDownloader:
                     if self.output_dir:
                         os.makedirs(self.output_dir, exist_ok=True)
                         filepath = os.path.join(self.output_dir, filename)
-                        with open(filepath, 'w', encoding='utf-8') as f:
-                            json.dump(result, f, indent=2)
+                        write_atomic(filepath, encode_with_size(result, indent=True))
                         logger.info(f"✓ {store_name}: {result['product_count']} products (local)")
                         return (filepath, result)
                     else:
@@ -201,6 +302,25 @@ class CuraleafDownloader:
             logger.error(f"✗ {store_name}: Error: {e}")
             return None
 
+    def _upload(self, result: Dict, azure_path: str) -> bool:
+        """Upload a store result, encoding it once when the manager accepts bytes."""
+        save_bytes = getattr(self.azure_manager, 'save_bytes_to_data_lake', None)
+        if save_bytes is None:
+            with self._upload_sem:
+                return self.azure_manager.save_json_to_data_lake(
+                    json_data=result,
+                    file_path=azure_path,
+                    overwrite=True
+                )
+        payload = encode_with_size(result, indent=True)
+        with self._upload_sem:
+            return save_bytes(
+                payload,
+                file_path=azure_path,
+                overwrite=True,
+                json_data=result
+            )
+
     def download(self, parallel: bool = True) -> List[Tuple[str, Dict]]:
         """
         Download from stores in current batch (or all stores if no batch specified).
@@ -223,35 +343,30 @@ class CuraleafDownloader:
         success_count = 0
         fail_count = 0
         
+        # One timestamp and date folder for every file in this run
+        now = datetime.now()
+        run_ts = now.strftime("%Y%m%d_%H%M%S")
+        date_folder = now.strftime("%Y/%m/%d")
+        now_iso = datetime.now(timezone.utc).isoformat()
+        
         if parallel and self.parallel_stores > 1:
-            # Parallel download using ThreadPoolExecutor
-            with ThreadPoolExecutor(max_workers=self.parallel_stores) as executor:
-                future_to_store = {
-                    executor.submit(self._download_store_with_save, store): store 
-                    for store in self.stores
-                }
-                
-                for future in as_completed(future_to_store):
-                    store = future_to_store[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            results.append(result)
-                            success_count += 1
-                        else:
-                            fail_count += 1
-                    except Exception as e:
-                        logger.error(f"✗ {store['name']}: Thread error: {e}")
-                        fail_count += 1
-        else:
-            # Sequential download (original behavior)
-            for store in self.stores:
-                result = self._download_store_with_save(store)
+            # Concurrent download: one event loop, one shared connection pool
+            for result in self._run_async_download(run_ts, date_folder, now_iso):
                 if result:
                     results.append(result)
                     success_count += 1
                 else:
                     fail_count += 1
+        else:
+            # Sequential download (original behavior) over one HTTP client
+            with self._scraper:
+                for store in self.stores:
+                    result = self._download_store_with_save(store, run_ts, date_folder, now_iso)
+                    if result:
+                        results.append(result)
+                        success_count += 1
+                    else:
+                        fail_count += 1
         
         logger.info(f"\n{self.dispensary_name} Download Complete{batch_info}:")
         logger.info(f"   Success: {success_count}/{len(self.stores)} stores")
@@ -271,7 +386,7 @@ class CuraleafDownloader:
             (filepath, data) tuple or None if failed
         """
         # Search in all_stores, not just the batched stores
-        store_info = next((s for s in self.all_stores if s['slug'] == store_slug), None)
+        store_info = self._stores_by_slug.get(store_slug)
         if not store_info:
             logger.error(f"Store not found: {store_slug}")
             return None
@@ -284,11 +399,7 @@ class CuraleafDownloader:
             if self.azure_manager:
                 date_folder = datetime.now().strftime("%Y/%m/%d")
                 azure_path = f"dispensaries/curaleaf/{date_folder}/{filename}"
-                success = self.azure_manager.save_json_to_data_lake(
-                    json_data=result,
-                    file_path=azure_path,
-                    overwrite=True
-                )
+                success = self._upload(result, azure_path)
                 if success:
                     return (f"azure://{azure_path}", result)
             
@@ -2,31 +2,227 @@
 The Flowery Downloader Module
 Downloads menu data from all The Flowery locations using Bearer token authentication
 """
+import asyncio
+import base64
 import json
+import math
 import os
+import re
+import threading
+import httpx
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, List, Dict, Optional, Tuple
 
 # Selenium is optional - only needed for token extraction
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
     webdriver = None
     Options = None
+    WebDriverWait = None
+    TimeoutException = None
+
+try:
+    from ._shared import find_product, haversine_miles, index_products, json_dumps, write_atomic
+except ImportError:
+    from terprint_menu_downloader.downloaders._shared import (
+        find_product, haversine_miles, index_products, json_dumps, write_atomic
+    )
+
+# ijson parses product pages straight off the socket, one product at a
+# time; without it pages are buffered and decoded whole
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Degrees are rounded down so the pre-filter box never clips the radius
+MILES_PER_DEGREE = 69.0
+
+# Locations fetched at once; the bound is the politeness throttle
+DEFAULT_PARALLEL_LOCATIONS = 8
+# Pages 2..N of one location fetched at once by the sync path
+DEFAULT_PARALLEL_PAGES = 6
+# Azure uploads / local file writes in flight at once, independent of fetch
+# concurrency
+DEFAULT_PARALLEL_UPLOADS = 4
+# Static assets the token capture never needs; the shop page only has to
+# fire its products XHR
+BLOCKED_ASSET_PATTERNS = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.css', '*.woff', '*.woff2']
+# URL fragment identifying the products API request that carries the token
+PRODUCTS_API_MARKER = 'app.getsalve.co/api/products'
+# Upper bound on waiting for the shop page to send its first products request
+TOKEN_CAPTURE_TIMEOUT_SEC = 10
+# Treat a cached token as expired this long before its JWT ``exp``
+TOKEN_EXPIRY_MARGIN_SEC = 60
+# How long get_stock_status reuses a menu snapshot and its batch index
+PRODUCT_INDEX_TTL_SEC = 60
+# How long a successful location download is reused by get_stock_status and
+# download_location_cached instead of paginating the menu again
+SNAPSHOT_TTL_SEC = 900
+# How long the on-disk locations list is trusted before refetching
+LOCATIONS_CACHE_TTL_SEC = 3600
+# ``last_page`` of a paginated page whose ``meta`` gives none; pages are then
+# walked until one comes back empty, at most MAX_UNBOUNDED_PAGES of them
+LAST_PAGE_UNKNOWN = 0
+MAX_UNBOUNDED_PAGES = 100
+# 429 retries per products page, and the longest Retry-After honoured
+RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_WAIT_SEC = 30
+
+
+def _rate_limit_delay(response) -> float:
+    """
+    Seconds to wait before the next products request: the Retry-After of a
+    429, or of a response reporting at most one request left in its window
+    (1 s when it gives none); otherwise 0.
+    """
+    headers = response.headers
+    if response.status_code != 429:
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None or not remaining.strip().isdigit() or int(remaining) > 1:
+            return 0.0
+    try:
+        delay = float(headers.get('Retry-After', 1))
+    except ValueError:  # HTTP-date form
+        delay = 1.0
+    return min(max(delay, 0.0), MAX_RATE_LIMIT_WAIT_SEC)
+
+
+_EDIBLE_RE = re.compile(r"edible", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _safe_location_name(name: str) -> str:
+    """Filename-safe form of a location name; '/' would otherwise split the path"""
+    return name.lower().replace(' ', '_').replace('/', '-')
+
+
+def _is_edible(product: Dict) -> bool:
+    """Terprint only processes flower, concentrates, and vapes"""
+    # Case-insensitive search on the category as-is: no lowercased copy per
+    # category, and str() only for non-string (e.g. dict) categories
+    categories = product.get("categories") or (product.get("category") or "",)
+    return any(
+        _EDIBLE_RE.search(cat if isinstance(cat, str) else str(cat)) for cat in categories
+    )
+
+
+# ijson events carrying a complete scalar value
+_SCALAR_EVENTS = frozenset({'null', 'boolean', 'integer', 'double', 'number', 'string'})
+
+
+def _stream_page(fp) -> Tuple[List[Dict], Optional[int], int]:
+    """
+    ``FloweryDownloader._parse_page`` over a streamed response body.
+    
+    Products are built one at a time from ijson events and edibles are
+    dropped as they complete, so neither the full page tree nor the
+    filtered-out products are held in memory.
+    """
+    kept: List[Dict] = []
+    dropped = 0
+    last_page = LAST_PAGE_UNKNOWN
+    paginated = False
+    item_prefix = None
+    builder = None
+    depth = 0
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 0:
+                    product, builder = builder.value, None
+                    if isinstance(product, dict) and _is_edible(product):
+                        dropped += 1
+                    else:
+                        kept.append(product)
+            continue
+        if item_prefix is None:
+            # The first event tells a bare product list from {"data": [...], "meta": {...}}
+            item_prefix = 'item' if event == 'start_array' else 'data.item'
+        elif prefix == item_prefix:
+            if event in ('start_map', 'start_array'):
+                builder = ijson.common.ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+            else:
+                kept.append(value)
+        elif prefix == '' and event == 'map_key' and value == 'data':
+            paginated = True
+        elif prefix == 'meta.last_page' and event in _SCALAR_EVENTS:
+            # Taken as-is (an explicit null included), as _parse_page does
+            last_page = value
+    
+    if item_prefix == 'item':
+        return kept, None, dropped
+    if not paginated:
+        return [], None, 0
+    return kept, last_page, dropped
+
+
+def _location_coords(location: Dict) -> Tuple[Optional[float], Optional[float]]:
+    """(lat, lng) of a locations-API entry; None for a missing coordinate"""
+    lat = location.get('latitude') or location.get('lat')
+    lng = location.get('longitude') or location.get('lng') or location.get('lon')
+    return (float(lat) if lat else None, float(lng) if lng else None)
+
+
+def _products_bearer(raw_message: str) -> Optional[str]:
+    """Bearer token of a ``Network.requestWillBeSent`` log entry for the products API, else None"""
+    try:
+        message = json.loads(raw_message)['message']
+        if message.get('method') != 'Network.requestWillBeSent':
+            return None
+        request = message['params']['request']
+        if PRODUCTS_API_MARKER not in request.get('url', ''):
+            return None
+        auth_header = request.get('headers', {}).get('Authorization', '')
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+        return None
+    return auth_header[len('Bearer '):] if auth_header.startswith('Bearer ') else None
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """``exp`` claim (epoch seconds) of a JWT, or None if it has none / isn't a JWT"""
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        exp = claims.get('exp')
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
 
 
 class FloweryDownloader:
     """Download menu data from The Flowery dispensaries"""
     
-    def __init__(self, output_dir: str = "downloads", azure_manager=None, location_ids=None):
+    # Process-wide (token, exp) so warm workers and new instances skip the
+    # env/file/Selenium lookup until the token expires or is rejected
+    _token_cache: Optional[Tuple[str, Optional[float]]] = None
+    _token_lock = threading.Lock()
+    
+    def __init__(self, output_dir: str = "downloads", azure_manager=None, location_ids=None,
+                 parallel: int = DEFAULT_PARALLEL_LOCATIONS):
         self.output_dir = output_dir
         self.azure_manager = azure_manager
         self.location_ids = location_ids  # Optional list of specific location IDs to download
+        self.parallel = parallel
         self.flowery_dir = os.path.join(output_dir, "flowery") if output_dir else None
         
         # API endpoints
@@ -35,9 +231,51 @@ class FloweryDownloader:
         
         # Bearer token (will be extracted from Selenium session)
         self.bearer_token = None
+        self._auth_headers: Dict[str, str] = {}
         
         # Locations data
         self.locations = []
+        
+        # Menu snapshot for get_stock_status: location_id -> products (None
+        # when the download failed), plus location_id -> search index over
+        # its products' batch/SKU text (see _batch_and_sku)
+        self._snapshot: Dict[int, Optional[List[Dict]]] = {}
+        self._product_index: Dict[int, Tuple[str, List[int]]] = {}
+        self._snapshot_at = 0.0
+        # Last successful download per location: location_id -> (monotonic
+        # time, result)
+        self._result_cache: Dict[int, Tuple[float, Dict]] = {}
+        
+        # Keep-alive session: one TLS handshake per host instead of one per
+        # page, with backoff on throttling and transient server errors
+        self._session = requests.Session()
+        self._session.headers.update({'Accept': 'application/json'})
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"GET"}))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+    
+    def close(self):
+        """Close the pooled HTTP session"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _products_headers(self) -> Dict[str, str]:
+        """Bearer headers for the products API, rebuilt only when the token changes"""
+        if self._auth_headers.get('Authorization') != f'Bearer {self.bearer_token}':
+            # Sent per request rather than as session defaults so the token
+            # never goes to the locations API host
+            self._auth_headers = {
+                'Authorization': f'Bearer {self.bearer_token}',
+                'Content-Type': 'application/json'
+            }
+        return self._auth_headers
     
     def _extract_bearer_token(self) -> Optional[str]:
         """Extract Bearer token from Selenium session by loading the website"""
@@ -49,38 +287,40 @@ class FloweryDownloader:
             chrome_options.add_argument('--disable-gpu')
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+            chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.default_content_setting_values.cookies': 1,
+            })
             chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
             
             driver = webdriver.Chrome(options=chrome_options)
             
             try:
+                # Skip images, stylesheets and fonts - only the products XHR matters
+                try:
+                    driver.execute_cdp_cmd('Network.enable', {})
+                    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_ASSET_PATTERNS})
+                except Exception as e:
+                    print(f"Could not block static assets: {e}")
+                
                 # Load the shop page
                 driver.get("https://theflowery.co/shop")
-                time.sleep(3)  # Wait for API calls
                 
-                # Get performance logs
-                logs = driver.get_log('performance')
+                # Poll the performance log until the products API call shows
+                # up. get_log drains the buffer, so each poll only scans new
+                # entries and until() hands back the token it found.
+                try:
+                    token = WebDriverWait(driver, TOKEN_CAPTURE_TIMEOUT_SEC, poll_frequency=0.25).until(
+                        lambda d: self._scan_for_token(d.get_log('performance'))
+                    )
+                except TimeoutException:
+                    token = None
                 
-                # Extract Bearer token from network requests
-                for log in logs:
-                    try:
-                        message = json.loads(log['message'])
-                        method = message.get('message', {}).get('method')
-                        
-                        if method == 'Network.requestWillBeSent':
-                            request = message['message']['params']['request']
-                            url = request.get('url', '')
-                            headers = request.get('headers', {})
-                            
-                            # Look for products API calls with Authorization header
-                            if 'app.getsalve.co/api/products' in url:
-                                auth_header = headers.get('Authorization', '')
-                                if auth_header.startswith('Bearer '):
-                                    token = auth_header.replace('Bearer ', '')
-                                    print(f"✓ Bearer token extracted (length: {len(token)})")
-                                    return token
-                    except:
-                        continue
+                if token:
+                    print(f"✓ Bearer token extracted (length: {len(token)})")
+                    return token
                 
                 print("✗ Could not find Bearer token in network logs")
                 return None
@@ -92,13 +332,59 @@ class FloweryDownloader:
             print(f"Error extracting Bearer token: {e}")
             return None
     
+    @staticmethod
+    def _scan_for_token(logs: List[Dict]) -> Optional[str]:
+        """Bearer token sent to the products API in a batch of performance log entries"""
+        # Lazily parsed; next() stops at the first match, and entries that
+        # never mention the products API are not JSON-decoded at all
+        tokens = (
+            _products_bearer(log.get('message'))
+            for log in logs
+            if PRODUCTS_API_MARKER in (log.get('message') or '')
+        )
+        return next((token for token in tokens if token), None)
+    
+    @classmethod
+    def _cached_token(cls) -> Optional[str]:
+        """Process-cached token, unless its JWT ``exp`` is (nearly) reached"""
+        cached = cls._token_cache
+        if not cached:
+            return None
+        token, exp = cached
+        if exp is not None and exp - TOKEN_EXPIRY_MARGIN_SEC <= time.time():
+            return None
+        return token
+    
+    @classmethod
+    def _remember_token(cls, token: Optional[str]) -> None:
+        cls._token_cache = (token, _jwt_expiry(token)) if token else None
+    
+    def _save_token_file(self, token: str) -> None:
+        """Persist an extracted token for the next process"""
+        if not self.flowery_dir:
+            return
+        token_file = os.path.join(self.flowery_dir, "bearer_token.txt")
+        try:
+            with open(token_file, 'w') as f:
+                f.write(token)
+            print(f"✓ Bearer token saved to {token_file}")
+        except OSError:
+            pass
+    
     def _load_bearer_token(self) -> bool:
         """Load or extract Bearer token"""
+        # Token already loaded by this process and not expired
+        cached = self._cached_token()
+        if cached:
+            self.bearer_token = cached
+            return True
+        
         # First try environment variable (for Azure Functions)
         env_token = os.environ.get('FLOWERY_BEARER_TOKEN')
         if env_token:
             self.bearer_token = env_token.strip()
             print(f"✓ Loaded Bearer token from environment variable (length: {len(self.bearer_token)})")
+            self._remember_token(self.bearer_token)
             return True
         
         # Try to load from saved file
@@ -108,8 +394,9 @@ class FloweryDownloader:
                 with open(token_file, 'r') as f:
                     self.bearer_token = f.read().strip()
                 print(f"✓ Loaded Bearer token from file (length: {len(self.bearer_token)})")
+                self._remember_token(self.bearer_token)
                 return True
-            except:
+            except (OSError, ValueError):
                 pass
         
         # Extract fresh token (requires Selenium)
@@ -120,21 +407,80 @@ class FloweryDownloader:
         self.bearer_token = self._extract_bearer_token()
         if self.bearer_token:
             # Save for future use
-            try:
-                with open(token_file, 'w') as f:
-                    f.write(self.bearer_token)
-                print(f"✓ Bearer token saved to {token_file}")
-            except:
-                pass
+            self._remember_token(self.bearer_token)
+            self._save_token_file(self.bearer_token)
             return True
         
         return False
     
-    def _fetch_locations(self) -> bool:
-        """Fetch all location data from The Flowery locations API"""
+    def _refresh_bearer_token(self, rejected_token: Optional[str]) -> bool:
+        """
+        Replace a token the products API rejected (HTTP 401).
+        
+        Concurrent callers that saw the same rejected token share one refresh;
+        returns True when a different token is now in place.
+        """
+        with self._token_lock:
+            if self.bearer_token and self.bearer_token != rejected_token:
+                return True
+            cached = self._cached_token()
+            if cached and cached != rejected_token:
+                self.bearer_token = cached
+                return True
+            self._remember_token(None)
+            if not SELENIUM_AVAILABLE:
+                print("✗ Bearer token rejected (401) and Selenium not available to refresh it")
+                return False
+            print("Bearer token rejected (401) - extracting a fresh one")
+            token = self._extract_bearer_token()
+            if not token or token == rejected_token:
+                return False
+            self.bearer_token = token
+            self._remember_token(token)
+            self._save_token_file(token)
+            return True
+    
+    def _load_cached_locations(self) -> Optional[List[Dict]]:
+        """Locations from ``locations_cache.json`` if it is younger than the TTL"""
+        if not self.flowery_dir:
+            return None
+        cache_file = os.path.join(self.flowery_dir, "locations_cache.json")
+        try:
+            if time.time() - os.path.getmtime(cache_file) >= LOCATIONS_CACHE_TTL_SEC:
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                locations = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return locations if isinstance(locations, list) and locations else None
+    
+    def _save_cached_locations(self, locations: List[Dict]) -> None:
+        """Write the locations list to ``locations_cache.json`` atomically"""
+        if not self.flowery_dir:
+            return
+        cache_file = os.path.join(self.flowery_dir, "locations_cache.json")
+        try:
+            os.makedirs(self.flowery_dir, exist_ok=True)
+            write_atomic(cache_file, json_dumps(locations))
+        except OSError as e:
+            print(f"Could not cache locations: {e}")
+    
+    def _fetch_locations(self, force_refresh: bool = False) -> bool:
+        """Fetch all location data from The Flowery locations API
+        
+        A list cached on disk within LOCATIONS_CACHE_TTL_SEC is reused unless
+        ``force_refresh`` is set.
+        """
+        if not force_refresh:
+            cached = self._load_cached_locations()
+            if cached:
+                self.locations = cached
+                print(f"✓ Loaded {len(self.locations)} locations from cache")
+                return True
+        
         try:
             print("Fetching locations from The Flowery API...")
-            response = requests.get(self.locations_api, timeout=30)
+            response = self._session.get(self.locations_api, timeout=30)
             response.raise_for_status()
             
             locations_data = response.json()
@@ -149,6 +495,7 @@ class FloweryDownloader:
             
             if self.locations:
                 print(f"✓ Found {len(self.locations)} locations")
+                self._save_cached_locations(self.locations)
                 return True
             else:
                 print("✗ No locations found")
@@ -165,65 +512,288 @@ class FloweryDownloader:
                 print("No Bearer token available")
                 return None
             
-            headers = {
-                'Authorization': f'Bearer {self.bearer_token}',
-                'Accept': 'application/json',
-                'Content-Type': 'application/json'
-            }
+            session_get = self._session.get
             
-            all_products = []
-            current_page = 1
-            total_pages = 1
+            def fetch_page(page: int) -> Tuple[List[Dict], Optional[int], int]:
+                url = self._page_url(location_id, page)
+                token = self.bearer_token
+                response = session_get(url, headers=self._products_headers(), timeout=30,
+                                       stream=IJSON_AVAILABLE)
+                if response.status_code == 401 and self._refresh_bearer_token(token):
+                    response.close()
+                    response = session_get(url, headers=self._products_headers(), timeout=30,
+                                           stream=IJSON_AVAILABLE)
+                # 429s are retried by the session's Retry, honouring Retry-After
+                with response:
+                    response.raise_for_status()
+                    delay = _rate_limit_delay(response)
+                    if IJSON_AVAILABLE:
+                        response.raw.decode_content = True  # undo gzip/deflate transparently
+                        parsed = _stream_page(response.raw)
+                    else:
+                        parsed = self._parse_page(response.json())
+                if delay:
+                    time.sleep(delay)
+                return parsed
             
-            # Fetch all pages
-            while current_page <= total_pages:
-                api_url = f"{self.products_api}?location_id={location_id}&page={current_page}"
-                response = requests.get(api_url, headers=headers, timeout=30)
-                response.raise_for_status()
-                
-                response_data = response.json()
-                
-                # Handle paginated response
-                if isinstance(response_data, dict) and 'data' in response_data:
-                    products = response_data['data']
+            # Page 1 reveals last_page; the rest are fetched together on the
+            # pooled session, whose pool size is the throttle
+            all_products, total_pages, edibles = fetch_page(1)
+            if total_pages == LAST_PAGE_UNKNOWN:
+                products, dropped, page = all_products, edibles, 1
+                while (products or dropped) and page < MAX_UNBOUNDED_PAGES:
+                    page += 1
+                    products, _, dropped = fetch_page(page)
                     all_products.extend(products)
-                    
-                    meta = response_data.get('meta', {})
-                    total_pages = meta.get('last_page', 1)
-                    current_page += 1
-                elif isinstance(response_data, list):
-                    all_products.extend(response_data)
-                    break  # No pagination
-                else:
-                    break
-                
-                time.sleep(0.2)  # Rate limiting between pages
+                    edibles += dropped
+            elif total_pages and total_pages > 1:
+                extend = all_products.extend
+                with ThreadPoolExecutor(max_workers=min(DEFAULT_PARALLEL_PAGES, total_pages - 1)) as pool:
+                    for products, _, dropped in pool.map(fetch_page, range(2, total_pages + 1)):
+                        extend(products)
+                        edibles += dropped
             
-            # Filter out edibles — Terprint only processes flower, concentrates, and vapes
-            filtered_products = [
-                p for p in all_products
-                if not any("edible" in str(cat).lower() for cat in (p.get("categories") or [p.get("category", "")]))
-            ]
-            edibles_filtered = len(all_products) - len(filtered_products)
-            if edibles_filtered:
-                print(f"  (filtered out {edibles_filtered} edibles product(s))")
-
-            result = {
-                "location_id": location_id,
-                "location": location_name,
-                "download_timestamp": datetime.now().isoformat(),
-                "api_url": f"{self.products_api}?location_id={location_id}",
-                "total_products": len(filtered_products),
-                "product_count": len(filtered_products),
-                "products": filtered_products
-            }
+            return self._build_result(location_id, location_name, all_products, edibles)
+            
+        except Exception as e:
+            print(f"Error downloading location {location_name}: {e}")
+            return None
+    
+    async def download_location_async(self, client: httpx.AsyncClient, sem: asyncio.Semaphore,
+                                      location_id: int, location_name: str) -> Optional[Dict]:
+        """Async ``download_location`` on a shared client; one ``sem`` slot per location"""
+        try:
+            if not self.bearer_token:
+                print("No Bearer token available")
+                return None
+            
+            async def fetch_page(page: int) -> Tuple[List[Dict], Optional[int], int]:
+                url = self._page_url(location_id, page)
+                token = self.bearer_token
+                response = await client.get(url, headers=self._products_headers())
+                if response.status_code == 401 and await asyncio.to_thread(self._refresh_bearer_token, token):
+                    response = await client.get(url, headers=self._products_headers())
+                for _ in range(RATE_LIMIT_RETRIES):
+                    if response.status_code != 429:
+                        break
+                    await asyncio.sleep(_rate_limit_delay(response))
+                    response = await client.get(url, headers=self._products_headers())
+                response.raise_for_status()
+                # Near the end of the rate-limit window: pace this location
+                delay = _rate_limit_delay(response)
+                if delay:
+                    await asyncio.sleep(delay)
+                return self._parse_page(response.json())
             
-            return result
+            async with sem:
+                # Page 1 reveals last_page; the rest go out together and are
+                # bounded by the client's connection limit
+                all_products, total_pages, edibles = await fetch_page(1)
+                if total_pages == LAST_PAGE_UNKNOWN:
+                    products, dropped, page = all_products, edibles, 1
+                    while (products or dropped) and page < MAX_UNBOUNDED_PAGES:
+                        page += 1
+                        products, _, dropped = await fetch_page(page)
+                        all_products.extend(products)
+                        edibles += dropped
+                elif total_pages and total_pages > 1:
+                    pages = await asyncio.gather(*(fetch_page(p) for p in range(2, total_pages + 1)))
+                    for products, _, dropped in pages:
+                        all_products.extend(products)
+                        edibles += dropped
+            
+            return self._build_result(location_id, location_name, all_products, edibles)
             
         except Exception as e:
             print(f"Error downloading location {location_name}: {e}")
             return None
     
+    def _page_url(self, location_id: int, page: int) -> str:
+        return f"{self.products_api}?location_id={location_id}&page={page}"
+    
+    @staticmethod
+    def _parse_page(response_data) -> Tuple[List[Dict], Optional[int], int]:
+        """
+        Non-edible products on one products-API page, its ``last_page``
+        (None when unpaginated, LAST_PAGE_UNKNOWN when ``meta`` lacks it) and
+        the number of edibles dropped
+        """
+        if isinstance(response_data, dict) and 'data' in response_data:
+            meta = response_data.get('meta') or {}
+            products, last_page = response_data['data'], meta.get('last_page', LAST_PAGE_UNKNOWN)
+        elif isinstance(response_data, list):
+            products, last_page = response_data, None
+        else:
+            return [], None, 0
+        kept = [p for p in products if not _is_edible(p)]
+        return kept, last_page, len(products) - len(kept)
+    
+    def _build_result(self, location_id: int, location_name: str, filtered_products: List[Dict],
+                      edibles_filtered: int = 0) -> Dict:
+        """Wrap one location's (edible-free) products in the download envelope"""
+        if edibles_filtered:
+            print(f"  (filtered out {edibles_filtered} edibles product(s))")
+
+        return {
+            "location_id": location_id,
+            "location": location_name,
+            "download_timestamp": datetime.now().isoformat(),
+            "api_url": f"{self.products_api}?location_id={location_id}",
+            "total_products": len(filtered_products),
+            "product_count": len(filtered_products),
+            "products": filtered_products
+        }
+    
+    def _cached_result(self, location_id: int) -> Optional[Dict]:
+        """Result of a download of this location within SNAPSHOT_TTL_SEC, if any"""
+        cached = self._result_cache.get(location_id)
+        if cached and time.monotonic() - cached[0] < SNAPSHOT_TTL_SEC:
+            return cached[1]
+        return None
+    
+    def _remember_result(self, location_id: int, result: Dict) -> None:
+        self._result_cache[location_id] = (time.monotonic(), result)
+    
+    def download_location_cached(self, location_id: int, location_name: str) -> Optional[Dict]:
+        """``download_location``, reusing a result fetched within SNAPSHOT_TTL_SEC"""
+        result = self._cached_result(location_id)
+        if result is None:
+            result = self.download_location(location_id, location_name)
+            if result:
+                self._remember_result(location_id, result)
+        return result
+    
+    def invalidate_snapshot(self, location_id: Optional[int] = None) -> None:
+        """Forget cached downloads (one location, or all) and the stock index"""
+        if location_id is None:
+            self._result_cache.clear()
+        else:
+            self._result_cache.pop(location_id, None)
+        self._snapshot = {}
+        self._product_index = {}
+        self._snapshot_at = 0.0
+    
+    def _menu_snapshot(self, locations: List[Dict]) -> Dict[int, Optional[List[Dict]]]:
+        """
+        Products per location for stock lookups, with their batch/SKU text
+        indexed for substring search.
+        
+        Within PRODUCT_INDEX_TTL_SEC only locations missing from the snapshot
+        are added; after that the snapshot and index start over. Locations
+        downloaded within SNAPSHOT_TTL_SEC (e.g. by a preceding download_all)
+        are taken from the result cache instead of being fetched again.
+        """
+        if time.monotonic() - self._snapshot_at > PRODUCT_INDEX_TTL_SEC:
+            self._snapshot = {}
+            self._product_index = {}
+            self._snapshot_at = time.monotonic()
+        
+        missing = [loc for loc in locations if loc.get('id') not in self._snapshot]
+        if missing:
+            results = {loc.get('id'): self._cached_result(loc.get('id')) for loc in missing}
+            stale = [loc for loc in missing if results[loc.get('id')] is None]
+            if stale:
+                for location, result in zip(stale, self._download_locations(stale)):
+                    results[location.get('id')] = result
+            for location in missing:
+                location_id = location.get('id')
+                result = results[location_id]
+                products = result.get('products', []) if result else None
+                self._snapshot[location_id] = products
+                if products:
+                    self._product_index[location_id] = index_products(products, self._batch_and_sku)
+        return self._snapshot
+    
+    @staticmethod
+    def _batch_and_sku(product: Dict) -> Tuple[str, str]:
+        """Batch ID and SKU of a Flowery product, as searched by get_stock_status"""
+        return (product.get('batch_id', '') or product.get('batchNumber', '') or '',
+                product.get('sku', '') or product.get('productSku', '') or '')
+    
+    def _location_name(self, location: Dict) -> str:
+        return location.get('name', f"Location_{location.get('id')}")
+    
+    async def _download_locations_async(
+        self, locations: List[Dict], save: Optional[Callable[[Dict, Optional[Dict]], Any]] = None
+    ) -> List[Any]:
+        """
+        Fetch every location concurrently; results follow ``locations`` order.
+        
+        With ``save``, each location is handed to ``save(location, result)`` in
+        a worker thread as soon as its own fetch finishes (at most
+        DEFAULT_PARALLEL_UPLOADS at once), so uploads overlap the remaining
+        fetches; the list then holds what ``save`` returned.
+        """
+        sem = asyncio.Semaphore(self.parallel)
+        upload_sem = asyncio.Semaphore(DEFAULT_PARALLEL_UPLOADS)
+        limits = httpx.Limits(max_connections=self.parallel, max_keepalive_connections=self.parallel)
+        async with httpx.AsyncClient(timeout=30, limits=limits, follow_redirects=True,
+                                     headers={'Accept': 'application/json'}) as client:
+            async def one(location: Dict):
+                result = await self.download_location_async(
+                    client, sem, location.get('id'), self._location_name(location)
+                )
+                if result:
+                    self._remember_result(location.get('id'), result)
+                if save is None:
+                    return result
+                async with upload_sem:
+                    return await asyncio.to_thread(save, location, result)
+            
+            return await asyncio.gather(*(one(loc) for loc in locations))
+    
+    def _download_locations(
+        self, locations: List[Dict], save: Optional[Callable[[Dict, Optional[Dict]], Any]] = None
+    ) -> List[Any]:
+        """Sync entry to ``_download_locations_async`` (safe inside a running loop)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._download_locations_async(locations, save))
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self._download_locations_async(locations, save)).result()
+    
+    def _write_location(self, location: Dict, result: Optional[Dict], timestamp: str) -> Optional[Dict]:
+        """Write one location's result to ``flowery_dir``; returns the result"""
+        if result:
+            location_name = self._location_name(location)
+            filename = f"flowery_{_safe_location_name(location_name)}_menu_{timestamp}.json"
+            with open(os.path.join(self.flowery_dir, filename), 'wb') as f:
+                f.write(json_dumps(result, indent=True))
+        return result
+    
+    def _save_location(self, location: Dict, result: Optional[Dict], timestamp: str,
+                       date_folder: str) -> Tuple[Optional[Dict], Optional[str], Optional[str]]:
+        """Upload one location's result to Azure; returns (result, filepath, error)"""
+        if not result:
+            return None, None, "Failed to download"
+        if not self.azure_manager:
+            return result, None, "Azure Data Lake Manager not available"
+        
+        location_name = self._location_name(location)
+        filename = f"flowery_{_safe_location_name(location_name)}_menu_{timestamp}.json"
+        azure_path = f"dispensaries/flowery/{date_folder}/{filename}"
+        try:
+            save_bytes = getattr(self.azure_manager, 'save_bytes_to_data_lake', None)
+            if save_bytes is None:
+                success = self.azure_manager.save_json_to_data_lake(
+                    json_data=result,
+                    file_path=azure_path,
+                    overwrite=True
+                )
+            else:
+                success = save_bytes(
+                    json_dumps(result, indent=True),
+                    file_path=azure_path,
+                    overwrite=True,
+                    json_data=result
+                )
+        except Exception as azure_error:
+            return result, None, f"Azure save error: {azure_error}"
+        if not success:
+            return result, None, "Failed to save to Azure"
+        return result, f"azure://{azure_path}", None
+    
     def download(self) -> List[Tuple[str, Dict]]:
         """
         Download menu data from all The Flowery locations
@@ -250,51 +820,30 @@ class FloweryDownloader:
         failed = 0
         total_products = 0
         
-        for location in self.locations:
+        # One timestamp and date folder for the whole run
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        date_folder = now.strftime("%Y/%m/%d")
+        
+        # Each location is uploaded as soon as it is fetched
+        saved = self._download_locations(
+            self.locations,
+            lambda location, result: self._save_location(location, result, timestamp, date_folder)
+        )
+        for location, (result, filepath, error) in zip(self.locations, saved):
             location_id = location.get('id')
-            location_name = location.get('name', f'Location_{location_id}')
-            
-            print(f"   Downloading {location_name} (ID: {location_id})...", end=" ")
+            location_name = self._location_name(location)
             
-            result = self.download_location(location_id, location_name)
+            print(f"   {location_name} (ID: {location_id}):", end=" ")
             
-            if result:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"flowery_{location_name.lower().replace(' ', '_')}_menu_{timestamp}.json"
-                
-                # Save to Azure Data Lake if available
-                if self.azure_manager:
-                    try:
-                        date_folder = datetime.now().strftime("%Y/%m/%d")
-                        azure_path = f"dispensaries/flowery/{date_folder}/{filename}"
-                        
-                        success = self.azure_manager.save_json_to_data_lake(
-                            json_data=result,
-                            file_path=azure_path,
-                            overwrite=True
-                        )
-                        
-                        if success:
-                            filepath = f"azure://{azure_path}"
-                            print(f"SUCCESS: {result['product_count']} products saved to Azure")
-                            results.append((filepath, result))
-                            successful += 1
-                            total_products += result['total_products']
-                        else:
-                            print(f"ERROR: Failed to save to Azure")
-                            failed += 1
-                    except Exception as azure_error:
-                        print(f"ERROR: Azure save error: {azure_error}")
-                        failed += 1
-                else:
-                    print(f"ERROR: Azure Data Lake Manager not available")
-                    failed += 1
+            if filepath:
+                print(f"SUCCESS: {result['product_count']} products saved to Azure")
+                results.append((filepath, result))
+                successful += 1
+                total_products += result['total_products']
             else:
-                print(f"ERROR: Failed to download")
+                print(f"ERROR: {error}")
                 failed += 1
-            
-            # Be nice to the server
-            time.sleep(1)
         
         print(f"\n{'='*60}")
         print(f"THE FLOWERY - Download Complete")
@@ -347,22 +896,21 @@ class FloweryDownloader:
         failed = 0
         total_products = 0
         
-        for location in self.locations:
+        # Individual location files are written as each fetch lands, while
+        # the remaining locations are still downloading
+        os.makedirs(self.flowery_dir, exist_ok=True)
+        run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        written = self._download_locations(
+            self.locations,
+            lambda location, result: self._write_location(location, result, run_timestamp)
+        )
+        for location, result in zip(self.locations, written):
             location_id = location.get('id')
-            location_name = location.get('name', f'Location_{location_id}')
+            location_name = self._location_name(location)
             
-            print(f"Downloading {location_name} (ID: {location_id})...", end=" ")
-            
-            result = self.download_location(location_id, location_name)
+            print(f"{location_name} (ID: {location_id}):", end=" ")
             
             if result:
-                # Save individual location file
-                filename = f"flowery_{location_name.lower().replace(' ', '_')}_menu_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                filepath = os.path.join(self.flowery_dir, filename)
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                
                 print(f"✓ {result['product_count']} products")
                 results.append(result)
                 successful += 1
@@ -370,16 +918,13 @@ class FloweryDownloader:
             else:
                 print(f"✗ Failed")
                 failed += 1
-            
-            # Be nice to the server
-            time.sleep(1)
         
         # Save combined results
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        combined_file = os.path.join(self.output_dir, f"flowery_downloads_{timestamp}.json")
+        finished = datetime.now()
+        combined_file = os.path.join(self.output_dir, f"flowery_downloads_{finished.strftime('%Y%m%d_%H%M%S')}.json")
         
         summary = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': finished.isoformat(),
             'locations': results,
             'summary': {
                 'successful': successful,
@@ -389,8 +934,8 @@ class FloweryDownloader:
             }
         }
         
-        with open(combined_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        with open(combined_file, 'wb') as f:
+            f.write(json_dumps(summary, indent=True))
         
         print(f"\n{'='*60}")
         print(f"THE FLOWERY - Download Complete")
@@ -432,19 +977,6 @@ def _flowery_get_stock_status(self, batch_id: str, store_id: str = None,
     Returns:
         Dict with stock status, stores carrying the product, and summary
     """
-    import math
-    
-    def calculate_distance(lat1, lng1, lat2, lng2):
-        """Calculate distance in miles between two coordinates"""
-        R = 3959  # Earth's radius in miles
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        dlat = math.radians(lat2 - lat1)
-        dlng = math.radians(lng2 - lng1)
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        return R * c
-    
     try:
         # Load bearer token and locations
         if not self.bearer_token:
@@ -458,77 +990,84 @@ def _flowery_get_stock_status(self, batch_id: str, store_id: str = None,
         if store_id:
             locations_to_check = [loc for loc in self.locations if str(loc.get('id')) == str(store_id)]
         
+        # Drop locations outside a lat/lng box around the user before any
+        # products request; the haversine pass below refines the survivors.
+        # Locations without coordinates can't be ruled out and are kept.
+        if user_lat and user_lng and max_distance:
+            dlat_deg = max_distance / MILES_PER_DEGREE
+            dlng_deg = max_distance / (MILES_PER_DEGREE * max(math.cos(math.radians(user_lat)), 0.01))
+            in_box = []
+            for loc in locations_to_check:
+                lat, lng = _location_coords(loc)
+                if (lat is None or lng is None
+                        or (abs(lat - user_lat) <= dlat_deg and abs(lng - user_lng) <= dlng_deg)):
+                    in_box.append(loc)
+            if locations_to_check and not in_box:
+                print(f"⚠️ No Flowery locations within {max_distance} miles of ({user_lat}, {user_lng})")
+            locations_to_check = in_box
+        
         in_stock_stores = []
         out_of_stock_stores = []
         product_name = None
         
+        snapshot = self._menu_snapshot(locations_to_check)
+        
         for location in locations_to_check:
             try:
                 location_id = location.get('id')
-                location_name = location.get('name', f'Location_{location_id}')
+                location_name = self._location_name(location)
                 
-                result = self.download_location(location_id, location_name)
-                if not result:
+                products = snapshot.get(location_id)
+                if products is None:
                     out_of_stock_stores.append({'store_id': str(location_id), 'in_stock': False})
                     continue
                 
-                products = result.get('products', [])
+                product = find_product(products, self._product_index.get(location_id), batch_id)
+                if product is None:
+                    out_of_stock_stores.append({'store_id': str(location_id), 'in_stock': False})
+                    continue
                 
-                # Search for batch_id in products
-                found = False
-                for product in products:
-                    prod_batch = str(product.get('batch_id', '') or product.get('batchNumber', '') or '')
-                    prod_sku = str(product.get('sku', '') or product.get('productSku', '') or '')
-                    
-                    if batch_id.lower() in prod_batch.lower() or batch_id.lower() in prod_sku.lower():
-                        found = True
-                        if not product_name:
-                            product_name = product.get('name', product.get('productName', 'Unknown'))
-                        
-                        # Get location coordinates
-                        loc_lat = location.get('latitude') or location.get('lat')
-                        loc_lng = location.get('longitude') or location.get('lng') or location.get('lon')
-                        
-                        store_info = {
-                            'store_id': str(location_id),
-                            'store_name': f"The Flowery - {location_name}",
-                            'in_stock': True,
-                            'price': product.get('price'),
-                            'quantity_available': product.get('quantity'),
-                            'location': {
-                                'address': location.get('address'),
-                                'lat': float(loc_lat) if loc_lat else None,
-                                'lng': float(loc_lng) if loc_lng else None
-                            },
-                            'distance_miles': None
-                        }
-                        
-                        # Calculate distance if available
-                        if user_lat and user_lng and store_info['location']['lat'] and store_info['location']['lng']:
-                            store_info['distance_miles'] = calculate_distance(
-                                user_lat, user_lng,
-                                store_info['location']['lat'], 
-                                store_info['location']['lng']
-                            )
-                            if max_distance and store_info['distance_miles'] > max_distance:
-                                continue
-                        
-                        in_stock_stores.append(store_info)
-                        break
+                if not product_name:
+                    product_name = product.get('name', product.get('productName', 'Unknown'))
                 
-                if not found:
-                    out_of_stock_stores.append({'store_id': str(location_id), 'in_stock': False})
+                # Get location coordinates
+                loc_lat, loc_lng = _location_coords(location)
+                
+                store_info = {
+                    'store_id': str(location_id),
+                    'store_name': f"The Flowery - {location_name}",
+                    'in_stock': True,
+                    'price': product.get('price'),
+                    'quantity_available': product.get('quantity'),
+                    'location': {
+                        'address': location.get('address'),
+                        'lat': loc_lat,
+                        'lng': loc_lng
+                    },
+                    'distance_miles': None
+                }
+                
+                in_stock_stores.append(store_info)
                     
-            except Exception as e:
+            except (KeyError, ValueError, TypeError, AttributeError) as e:
                 print(f"Error checking location {location.get('id')}: {e}")
                 continue
-            
-            # Rate limit
-            time.sleep(0.3)
         
-        # Sort by distance if available
+        # Distances for every located store in one pass, then filter and sort
         if user_lat and user_lng:
-            in_stock_stores.sort(key=lambda s: s.get('distance_miles') or float('inf'))
+            located = [s for s in in_stock_stores if s['location']['lat'] and s['location']['lng']]
+            if located:
+                coords = [(s['location']['lat'], s['location']['lng']) for s in located]
+                for store_info, miles in zip(located, haversine_miles(user_lat, user_lng, coords)):
+                    store_info['distance_miles'] = miles
+                if max_distance:
+                    in_stock_stores = [
+                        s for s in in_stock_stores
+                        if s['distance_miles'] is None or s['distance_miles'] <= max_distance
+                    ]
+            in_stock_stores.sort(
+                key=lambda s: s['distance_miles'] if s['distance_miles'] is not None else float('inf')
+            )
         
         return {
             'batch_id': batch_id,
@@ -8,19 +8,27 @@ upload, and parallel store downloads.
 Version: 2.0 - Sweed POS integration (replaces Squarespace scraper)
 """
 
-import json
 import logging
 import math
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from queue import Empty, Queue
 from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+try:
+    from ._shared import encode_with_size
+except ImportError:
+    from terprint_menu_downloader.downloaders._shared import encode_with_size
+
+
 # Constants
 DEFAULT_STORES_PER_BATCH = 6
 DEFAULT_PARALLEL_STORES = 3
+# Opt-in override for the store worker count when parallel_stores is not given
+PARALLEL_STORES_ENV = "GREEN_DRAGON_PARALLEL_STORES"
 
 # Detect if running as part of the installed package
 try:
@@ -48,30 +56,43 @@ class GreenDragonDownloader:
         max_products_per_store: Optional[int] = None,
         store_batch: Optional[int] = None,
         stores_per_batch: int = DEFAULT_STORES_PER_BATCH,
-        parallel_stores: int = DEFAULT_PARALLEL_STORES,
+        parallel_stores: Optional[int] = None,
         include_coa: bool = False,
+        pretty: bool = False,
     ):
         self.output_dir             = output_dir
         self.azure_manager          = azure_manager
         self.max_products_per_store = max_products_per_store
         self.dispensary_name        = "Green Dragon"
         self.include_coa            = include_coa
+        # Menu files are machine-read; indenting roughly doubles their size
+        self.pretty                 = pretty
 
         self.store_batch            = store_batch
         self.stores_per_batch       = stores_per_batch
-        self.parallel_stores        = parallel_stores
 
         # Import config & scraper (handles both package and standalone usage)
         if _RUNNING_AS_PACKAGE:
             from ..dispensaries.green_dragon import GREEN_DRAGON_CONFIG, FL_STORES
-            from ..dispensaries.green_dragon.scraper import GreenDragonStoreScraper
+            from ..dispensaries.green_dragon.scraper import GreenDragonStoreScraper, warm_shared_client
         else:
             from terprint_menu_downloader.dispensaries.green_dragon import GREEN_DRAGON_CONFIG, FL_STORES
-            from terprint_menu_downloader.dispensaries.green_dragon.scraper import GreenDragonStoreScraper
+            from terprint_menu_downloader.dispensaries.green_dragon.scraper import (
+                GreenDragonStoreScraper, warm_shared_client
+            )
 
         self.config         = GREEN_DRAGON_CONFIG
         self.all_stores     = FL_STORES
+        self._stores_by_slug = {s.slug: s for s in self.all_stores}
+        # all_stores and stores_per_batch are fixed for the downloader's lifetime
+        self._total_store_count = len(self.all_stores)
+        self._total_batches = math.ceil(self._total_store_count / self.stores_per_batch)
         self.scraper_class  = GreenDragonStoreScraper
+        self._warm_client   = warm_shared_client
+        self._scraper       = None
+        self._metadata      = None
+        self._output_dir_ready = False
+        self.parallel_stores = parallel_stores or self._default_parallel_stores()
 
         # Determine which stores to download for this batch
         self.stores = self._get_batch_stores()
@@ -88,6 +109,45 @@ class GreenDragonDownloader:
         logger.info(f"Green Dragon batch {self.store_batch}: stores {start_idx}-{end_idx-1} ({len(batch_stores)} stores)")
         return batch_stores
 
+    def _default_parallel_stores(self) -> int:
+        """Worker count from $GREEN_DRAGON_PARALLEL_STORES, else DEFAULT_PARALLEL_STORES."""
+        env_value = os.environ.get(PARALLEL_STORES_ENV)
+        if env_value:
+            try:
+                return max(1, int(env_value))
+            except ValueError:
+                logger.warning(f"Ignoring non-integer {PARALLEL_STORES_ENV}={env_value!r}")
+        return DEFAULT_PARALLEL_STORES
+
+    def _store_scraper(self):
+        """The scraper shared by every store (and worker thread) of this downloader.
+
+        It holds no per-store state and sends everything through the
+        process-wide keep-alive client, so one instance serves all calls.
+        """
+        if self._scraper is None:
+            self._scraper = self.scraper_class()
+        return self._scraper
+
+    def _batch_metadata(self) -> Dict[str, Any]:
+        """Store-independent result metadata, built once per batch.
+
+        Each call returns its own shallow copy, so a caller editing one
+        store result's metadata never changes another's.
+        """
+        metadata = self._metadata
+        if metadata is None or metadata["batch"] != self.store_batch:
+            metadata = self._metadata = {
+                "platform": "Sweed POS",
+                "platform_type": "json_extraction",
+                "coa_source": "LabDrive (mete.labdrive.net)",
+                "downloader_version": "2.0",
+                "batch": self.store_batch,
+                "stores_per_batch": self.stores_per_batch,
+                "include_coa": self.include_coa,
+            }
+        return dict(metadata)
+
     @property
     def store_count(self) -> int:
         """Return the number of stores configured for this batch."""
@@ -96,12 +156,12 @@ class GreenDragonDownloader:
     @property
     def total_batches(self) -> int:
         """Return the total number of batches needed."""
-        return (len(self.all_stores) + self.stores_per_batch - 1) // self.stores_per_batch
+        return self._total_batches
 
     @property
     def total_store_count(self) -> int:
         """Return the total number of stores across all batches."""
-        return len(self.all_stores)
+        return self._total_store_count
 
     def download_location(self, store_slug: str, store_name: str = None) -> Optional[Dict[str, Any]]:
         """
@@ -116,7 +176,7 @@ class GreenDragonDownloader:
         """
         try:
             # Get store info from config
-            store_info = next((s for s in self.all_stores if s.slug == store_slug), None)
+            store_info = self._stores_by_slug.get(store_slug)
             if not store_info:
                 logger.warning(f"Store {store_slug} not found in config")
                 return None
@@ -124,8 +184,7 @@ class GreenDragonDownloader:
             display_name = store_name or store_info.name
 
             # Use the sync Sweed POS scraper
-            scraper = self.scraper_class()
-            result = scraper.scrape_store(
+            result = self._store_scraper().scrape_store(
                 store=store_info,
                 categories=FL_CATEGORIES,
                 include_coa=self.include_coa,
@@ -133,6 +192,7 @@ class GreenDragonDownloader:
                 max_products=self.max_products_per_store,
             )
             products = result.get("products", [])
+            now_iso = datetime.now(timezone.utc).isoformat()
 
             return {
                 "dispensary": "green_dragon",
@@ -141,26 +201,24 @@ class GreenDragonDownloader:
                 "store_name": display_name,
                 "store_id": store_slug,
                 "state": store_info.state,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "download_time": datetime.now(timezone.utc).isoformat(),
+                "timestamp": now_iso,
+                "download_time": now_iso,
                 "product_count": len(products),
                 "products": products,
-                "metadata": {
-                    "platform": "Sweed POS",
-                    "platform_type": "json_extraction",
-                    "coa_source": "LabDrive (mete.labdrive.net)",
-                    "downloader_version": "2.0",
-                    "batch": self.store_batch,
-                    "stores_per_batch": self.stores_per_batch,
-                    "include_coa": self.include_coa,
-                }
+                "metadata": self._batch_metadata(),
             }
         except Exception as e:
             logger.error(f"Error downloading {store_slug}: {e}")
             return None
 
-    def _download_store_with_save(self, store) -> Optional[Tuple[str, Dict]]:
-        """Download a single store and save to Azure/local. Thread-safe for parallel execution."""
+    def _download_store_with_save(
+        self, store, run_ts: str = None, date_folder: str = None
+    ) -> Optional[Tuple[str, Dict]]:
+        """Download a single store and save to Azure/local. Thread-safe for parallel execution.
+
+        ``run_ts`` / ``date_folder`` let one batch share a single filename timestamp
+        and Azure date folder; both default to the current time.
+        """
         store_slug = store.slug
         store_name = store.name
 
@@ -169,23 +227,16 @@ class GreenDragonDownloader:
 
             if data and data.get('product_count', 0) > 0:
                 # Create filename with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = run_ts or datetime.now().strftime("%Y%m%d_%H%M%S")
                 filename = f"green_dragon_products_store_{store_slug}_{timestamp}.json"
 
-                # Add raw response size for tracking
-                data['raw_response_size'] = len(json.dumps(data))
-
                 # Save to Azure Data Lake if available
                 if self.azure_manager:
                     try:
-                        date_folder = datetime.now().strftime("%Y/%m/%d")
+                        date_folder = date_folder or datetime.now().strftime("%Y/%m/%d")
                         azure_path = f"dispensaries/green_dragon/{date_folder}/{filename}"
 
-                        success = self.azure_manager.save_json_to_data_lake(
-                            json_data=data,
-                            file_path=azure_path,
-                            overwrite=True
-                        )
+                        success = self._upload(data, azure_path)
 
                         if success:
                             logger.info(f"Uploaded {store_name}: {data['product_count']} products")
@@ -199,10 +250,14 @@ class GreenDragonDownloader:
                 else:
                     # No Azure manager - save locally if output_dir specified
                     if self.output_dir:
-                        os.makedirs(self.output_dir, exist_ok=True)
+                        # Created on the first local save only; exist_ok
+                        # covers workers racing to it
+                        if not self._output_dir_ready:
+                            os.makedirs(self.output_dir, exist_ok=True)
+                            self._output_dir_ready = True
                         filepath = os.path.join(self.output_dir, filename)
-                        with open(filepath, 'w', encoding='utf-8') as f:
-                            json.dump(data, f, indent=2)
+                        with open(filepath, 'wb') as f:
+                            f.write(encode_with_size(data, indent=self.pretty))
                         logger.info(f"Saved {store_name}: {data['product_count']} products (local)")
                         return (filepath, data)
                     else:
@@ -217,9 +272,21 @@ class GreenDragonDownloader:
             logger.error(f"Error downloading {store_name}: {e}")
             return None
 
+    def _upload(self, data: Dict, azure_path: str) -> bool:
+        """Upload a store result, encoding it once when the manager accepts bytes."""
+        save_bytes = getattr(self.azure_manager, 'save_bytes_to_data_lake', None)
+        if save_bytes is None:
+            return self.azure_manager.save_json_to_data_lake(
+                json_data=data,
+                file_path=azure_path,
+                overwrite=True
+            )
+        payload = encode_with_size(data, indent=self.pretty)
+        return save_bytes(payload, file_path=azure_path, overwrite=True, json_data=data)
+
     def download_single_store(self, store_slug: str) -> Optional[Tuple[str, Dict]]:
         """Download a single store by slug."""
-        store = next((s for s in self.all_stores if s.slug == store_slug), None)
+        store = self._stores_by_slug.get(store_slug)
         if not store:
             logger.error(f"Store {store_slug} not found")
             return None
@@ -243,23 +310,50 @@ class GreenDragonDownloader:
 
         logger.info(f"Downloading {len(self.stores)} stores from {self.dispensary_name}")
 
+        # One filename timestamp and Azure date folder for the whole batch
+        now = datetime.now()
+        run_ts = now.strftime("%Y%m%d_%H%M%S")
+        date_folder = now.strftime("%Y/%m/%d")
+
         if parallel:
-            with ThreadPoolExecutor(max_workers=self.parallel_stores) as executor:
-                futures = {
-                    executor.submit(self._download_store_with_save, store): store.slug
-                    for store in self.stores
-                }
-                for future in as_completed(futures):
+            # Workers are threads on purpose: the Sweed scraper is synchronous,
+            # every worker already shares one keep-alive (HTTP/2 when
+            # available) client, and the process-wide per-host rate limiter
+            # paces them all. Store time is dominated by that rate limit,
+            # not by thread switches, so an event loop would only
+            # re-wrap the same blocking calls.
+
+            # Resolve + connect once so workers share the warm connection
+            self._warm_client(self.config, include_coa=self.include_coa)
+
+            # Worker-queue fan-out: parallel_stores workers pull stores from a
+            # shared queue, so only O(workers) futures exist at any time
+            pending = Queue()
+            for store in self.stores:
+                pending.put_nowait(store)
+
+            def worker() -> List[Tuple[str, Dict]]:
+                worker_results = []
+                while True:
+                    try:
+                        store = pending.get_nowait()
+                    except Empty:
+                        return worker_results
                     try:
-                        result = future.result()
+                        result = self._download_store_with_save(store, run_ts, date_folder)
                         if result:
-                            results.append(result)
+                            worker_results.append(result)
                     except Exception as e:
-                        logger.error(f"Error in parallel download: {e}")
+                        logger.error(f"Error in parallel download ({store.slug}): {e}")
+
+            workers = min(self.parallel_stores, len(self.stores))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(worker) for _ in range(workers)]:
+                    results.extend(future.result())
         else:
             # Sequential download
             for store in self.stores:
-                result = self._download_store_with_save(store)
+                result = self._download_store_with_save(store, run_ts, date_folder)
                 if result:
                     results.append(result)
 
@@ -276,22 +370,21 @@ class GreenDragonDownloader:
         Returns:
             Dict mapping batch_index -> list of (filepath, data) tuples
         """
-        parallel_stores = parallel_stores or self.parallel_stores
         all_results = {}
 
-        for batch_idx in range(self.total_batches):
-            logger.info(f"Processing batch {batch_idx + 1}/{self.total_batches}")
-            downloader = GreenDragonDownloader(
-                output_dir=self.output_dir,
-                azure_manager=self.azure_manager,
-                max_products_per_store=self.max_products_per_store,
-                store_batch=batch_idx,
-                stores_per_batch=self.stores_per_batch,
-                parallel_stores=parallel_stores,
-                include_coa=self.include_coa,
-            )
-            batch_results = downloader.download(parallel=True)
-            all_results[batch_idx] = batch_results
+        # Step this downloader through the batches instead of building one per
+        # batch, so the config, slug index and scraper are set up once; the
+        # caller's batch selection is restored afterwards
+        saved = (self.store_batch, self.stores, self.parallel_stores)
+        self.parallel_stores = parallel_stores or self.parallel_stores
+        try:
+            for batch_idx in range(self.total_batches):
+                logger.info(f"Processing batch {batch_idx + 1}/{self.total_batches}")
+                self.store_batch = batch_idx
+                self.stores = self._get_batch_stores()
+                all_results[batch_idx] = self.download(parallel=True)
+        finally:
+            self.store_batch, self.stores, self.parallel_stores = saved
 
         return all_results
 
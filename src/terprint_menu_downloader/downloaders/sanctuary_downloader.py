@@ -17,7 +17,7 @@ Usage (standalone):
 import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
@@ -232,17 +232,18 @@ class SanctuaryDownloader:
 
         if parallel:
             with ThreadPoolExecutor(max_workers=self.parallel_stores) as executor:
-                futures = {
-                    executor.submit(self._download_store_with_save, store): store.slug
+                futures = [
+                    executor.submit(self._download_store_with_save, store)
                     for store in self.stores
-                }
-                for future in as_completed(futures):
+                ]
+                # Consumed in submission order, so results follow self.stores
+                for store, future in zip(self.stores, futures):
                     try:
                         result = future.result()
                         if result:
                             results.append(result)
                     except Exception as e:
-                        logger.error(f"Sanctuary: parallel download error: {e}")
+                        logger.error(f"Sanctuary: parallel download error [{store.slug}]: {e}")
         else:
             for store in self.stores:
                 result = self._download_store_with_save(store)
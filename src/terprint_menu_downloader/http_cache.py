@@ -0,0 +1,111 @@
+"""
+Conditional-GET Response Cache for Terprint Scrapers
+
+Keeps response bodies on disk keyed by URL, together with the ETag /
+Last-Modified validators the server sent. Repeat runs send
+If-None-Match / If-Modified-Since and reuse the stored body on a 304,
+so unchanged pages cost a round trip instead of a full download.
+
+Works with any client whose responses expose ``status_code``, ``headers``
+and ``content`` (httpx and requests both do).
+
+Usage:
+    from terprint_menu_downloader.http_cache import get_response_cache
+
+    cache = get_response_cache(".cache/green_dragon")
+    headers = {**base_headers, **cache.conditional_headers(url)}
+    resp = client.get(url, headers=headers)
+    if resp.status_code == 304:
+        body = cache.load(url)
+    else:
+        cache.store(url, resp.headers, resp.content)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Disk-backed URL → (validators, body) store for conditional GETs."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load_meta(self, url: str) -> Dict[str, Any]:
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(body_path):
+            return {}
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return meta if meta.get("url") == url else {}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a cached URL."""
+        meta = self._load_meta(url)
+        headers: Dict[str, str] = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Optional[bytes]:
+        """Return the cached body for ``url`` (after a 304), or None."""
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes) -> None:
+        """Cache a 200 response body if the server sent any validator."""
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+        try:
+            # Body first, then metadata — a reader never sees validators
+            # pointing at a half-written body.
+            self._write_atomic(body_path, body)
+            self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            logger.debug(f"Response cache write failed [{url}]: {e}")
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+@lru_cache(maxsize=None)
+def get_response_cache(cache_dir: str) -> ResponseCache:
+    """Return the shared ResponseCache for a directory."""
+    return ResponseCache(cache_dir)
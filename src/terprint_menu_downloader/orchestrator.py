@@ -214,7 +214,7 @@ class DispensaryOrchestrator:
             in_memory: Operate in-memory without local file writes
             curaleaf_batch: Specific Curaleaf batch to download (0-3), None for all
             curaleaf_stores_per_batch: Number of stores per Curaleaf batch (default 15)
-            curaleaf_parallel_stores: Number of parallel Curaleaf downloads (default 3)
+            curaleaf_parallel_stores: Number of concurrent Curaleaf downloads (default 3)
         """
         # Initialize logging on first instantiation
         _initialize_logging()
@@ -184,6 +184,47 @@ class AzureDataLakeManager:
             self.logger.error(f"Error saving JSON to Data Lake: {str(e)}")
             return False
 
+    def save_bytes_to_data_lake(self, data, file_path, overwrite=True, json_data=None):
+        """
+        Save already-encoded JSON bytes to Azure Data Lake
+        
+        Lets callers that serialized a payload once (e.g. for a local copy)
+        upload it without a second json.dumps.
+        
+        Args:
+            data (bytes): Encoded JSON document
+            file_path (str): Path in data lake (e.g., 'folder/filename.json')
+            overwrite (bool): Whether to overwrite existing file
+            json_data: Optional decoded dictionary, passed to the batch callback
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            # Call batch extraction callback before saving (if set)
+            if self.batch_callback and isinstance(json_data, dict):
+                try:
+                    self.batch_callback(file_path, json_data)
+                except Exception as cb_error:
+                    self.logger.warning(f"Batch callback error: {cb_error}")
+            
+            # Get file client
+            file_client = self.file_system_client.get_file_client(file_path)
+            
+            # Upload the file
+            file_client.upload_data(
+                data=data,
+                length=len(data),
+                overwrite=overwrite
+            )
+            
+            self.logger.info(f"Successfully saved JSON to: {file_path}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error saving JSON to Data Lake: {str(e)}")
+            return False
+
     def save_json_file_to_data_lake(self, local_file_path, remote_file_path, overwrite=True):
         """
         Upload a local JSON file to Azure Data Lake
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+# Ensure src/ is on sys.path for local test runs
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from terprint_menu_downloader.downloaders.cookies_downloader import CookiesDownloader
+
+
+def _menu(*products):
+    return {"location": "tampa", "product_count": len(products), "products": {"results": list(products)}}
+
+
+def test_stock_status_reports_the_first_substring_match(tmp_path, monkeypatch):
+    downloader = CookiesDownloader(output_dir=str(tmp_path))
+    menu = _menu(
+        {"name": "Containing", "batch": "FL-ABC123-2", "price": 30},
+        {"name": "Exact", "batch_id": "ABC123", "price": 40},
+        {"name": "By SKU", "sku": "SKU-777"},
+    )
+    monkeypatch.setattr(downloader, "download_location", lambda slug: menu)
+
+    status = downloader.get_stock_status("abc123", store_id="tampa")
+    assert status["product_name"] == "Containing"
+    assert status["stores"][0]["price"] == 30
+
+    assert downloader.get_stock_status("sku-777", store_id="tampa")["product_name"] == "By SKU"
+    assert downloader.get_stock_status("missing", store_id="tampa")["status"] == "out_of_stock"
+
+
+def _mock_async_client(monkeypatch, handler):
+    """Route the downloader's own AsyncClient through httpx.MockTransport"""
+    import functools
+    import httpx
+    from terprint_menu_downloader.downloaders import cookies_downloader
+
+    client_class = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(cookies_downloader.httpx, "AsyncClient", client_class)
+
+
+def test_download_fetches_locations_concurrently_in_order_without_sleeping(tmp_path, monkeypatch):
+    import asyncio
+    import httpx
+    from terprint_menu_downloader.downloaders import cookies_downloader
+
+    def no_sleep(*args):
+        raise AssertionError("politeness sleeps were removed")
+
+    monkeypatch.setattr(cookies_downloader.time, "sleep", no_sleep)
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request):
+        slug = request.url.params["retailer"]
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if slug == "miami":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"results": [{"name": slug, "batch_id": f"B-{slug}"}]})
+
+    _mock_async_client(monkeypatch, handler)
+
+    class FakeAzure:
+        def __init__(self):
+            self.paths = []
+
+        def save_json_to_data_lake(self, json_data, file_path, overwrite=True):
+            self.paths.append(file_path)
+            return True
+
+    azure = FakeAzure()
+    downloader = CookiesDownloader(output_dir=str(tmp_path), azure_manager=azure, parallel=3)
+    results = downloader.download()
+
+    expected = [slug for slug in downloader.location_slugs if slug != "miami"]
+    assert [data["location"] for _, data in results] == expected
+    assert all(data["product_count"] == 1 for _, data in results)
+    assert [path.rsplit("/", 1)[1].split("_menu_")[0] for path in azure.paths] == [
+        f"cookies_{slug}" for slug in expected
+    ]
+    assert 1 < in_flight["max"] <= 3
+
+
+def test_location_index_is_reused_within_the_minute_and_failures_are_retried(tmp_path, monkeypatch):
+    from terprint_menu_downloader.downloaders import cookies_downloader
+
+    clock = {"now": 600.0}
+    monkeypatch.setattr(cookies_downloader.time, "time", lambda: clock["now"])
+    downloader = CookiesDownloader(output_dir=str(tmp_path))
+    fetches = []
+    menus = {"tampa": [None, _menu({"batch_id": "A1"}), _menu({"batch_id": "A2"})]}
+
+    def download_location(slug):
+        fetches.append(slug)
+        return menus[slug][len(fetches) - 1]
+
+    monkeypatch.setattr(downloader, "download_location", download_location)
+
+    # A failed download is not cached
+    assert downloader._location_index("tampa") is None
+    first = downloader._location_index("tampa")
+    clock["now"] += 30
+    assert downloader._location_index("tampa") is first
+    assert fetches == ["tampa", "tampa"]
+
+    # The next minute downloads the menu again
+    clock["now"] += 60
+    _, products = downloader._location_index("tampa")
+    assert products == [{"batch_id": "A2"}]
+    assert fetches == ["tampa", "tampa", "tampa"]
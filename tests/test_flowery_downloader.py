@@ -0,0 +1,148 @@
+import sys
+from pathlib import Path
+
+# Ensure src/ is on sys.path for local test runs
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from terprint_menu_downloader.downloaders._shared import find_product, index_products
+from terprint_menu_downloader.downloaders.flowery_downloader import FloweryDownloader
+
+
+def _scan_products(products, batch_id):
+    """The linear scan the search index replaced: first batch/SKU containing batch_id"""
+    needle = batch_id.lower()
+    for product in products:
+        batch, sku = FloweryDownloader._batch_and_sku(product)
+        if needle in f"{batch}\x00{sku}".lower():
+            return product
+    return None
+
+
+def test_stock_lookup_returns_the_first_substring_match():
+    products = [
+        {"name": "Mint Cart", "batch_id": "FL-ABC123-2", "sku": "S-1"},
+        {"name": "Exact Batch", "batch_id": "ABC123", "sku": "S-2"},
+        {"name": "By SKU", "batchNumber": "", "productSku": "SKU-777"},
+    ]
+    index = index_products(products, FloweryDownloader._batch_and_sku)
+
+    for needle in ["abc123", "ABC123", "s-2", "sku-777", "123-2", "nope", "", "abc123\x00s"]:
+        assert find_product(products, index, needle) is _scan_products(products, needle), needle
+
+    # The exact batch match is not preferred over an earlier containing one
+    assert find_product(products, index, "ABC123")["name"] == "Mint Cart"
+    # A match never spans two products
+    assert find_product(products, index, "s-1\x01abc") is None
+
+
+def test_get_stock_status_reports_the_first_match_per_location(tmp_path):
+    downloader = FloweryDownloader(output_dir=str(tmp_path))
+    downloader.bearer_token = "token"
+    downloader.locations = [{"id": 1, "name": "Tampa"}, {"id": 2, "name": "Miami"}]
+    downloader._remember_result(1, {"products": [
+        {"name": "Containing", "batch_id": "XABC123", "price": 30},
+        {"name": "Exact", "batch_id": "ABC123", "price": 40},
+    ]})
+    downloader._remember_result(2, {"products": [{"name": "Other", "batch_id": "ZZZ"}]})
+
+    status = downloader.get_stock_status("abc123")
+
+    assert [s["store_id"] for s in status["stores"]] == ["1"]
+    assert status["stores"][0]["price"] == 30
+    assert status["product_name"] == "Containing"
+    assert status["summary"]["out_of_stock_count"] == 1
+
+
+def test_stream_page_matches_parse_page():
+    import io
+    import json
+
+    import pytest
+
+    pytest.importorskip("ijson")
+    from terprint_menu_downloader.downloaders.flowery_downloader import _stream_page
+
+    gummy = {"name": "Gummy", "categories": ["Edibles"]}
+    flower = {"name": "Gelato", "categories": ["Flower"], "thc": 24.5, "tags": [{"id": 1}]}
+    pages = [
+        {"data": [flower, gummy], "meta": {"last_page": 4}},
+        {"data": [flower], "meta": {"last_page": None}},
+        {"data": [flower], "meta": {"current_page": 1}},
+        {"data": [flower], "meta": None},
+        {"data": [], "meta": {"last_page": 1}},
+        [flower, gummy, flower],
+        {"error": "unauthorized"},
+    ]
+    for page in pages:
+        streamed = _stream_page(io.BytesIO(json.dumps(page).encode()))
+        assert streamed == FloweryDownloader._parse_page(page), page
+
+    # An explicit null means no known last page, not LAST_PAGE_UNKNOWN
+    assert _stream_page(io.BytesIO(b'{"data": [], "meta": {"last_page": null}}'))[1] is None
+
+
+def test_download_location_async_collects_every_page(tmp_path):
+    import asyncio
+    import httpx
+
+    flower = {"name": "Gelato", "categories": ["Flower"]}
+    gummy = {"name": "Gummy", "categories": ["Edibles"]}
+    pages = {
+        "1": {"data": [flower, gummy], "meta": {"last_page": 3}},
+        "2": {"data": [flower], "meta": {"last_page": 3}},
+        "3": {"data": [flower, flower], "meta": {"last_page": 3}},
+    }
+    seen = []
+
+    def handler(request):
+        page = request.url.params["page"]
+        seen.append((page, request.headers.get("authorization")))
+        # The first request for page 2 is throttled and retried
+        if page == "2" and seen.count(("2", "Bearer token")) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=pages[page])
+
+    downloader = FloweryDownloader(output_dir=str(tmp_path))
+    downloader.bearer_token = "token"
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await downloader.download_location_async(client, asyncio.Semaphore(1), 7, "Tampa")
+
+    result = asyncio.run(fetch())
+
+    assert result["location_id"] == 7
+    assert result["product_count"] == 4
+    assert all(p["name"] == "Gelato" for p in result["products"])
+    assert sorted(page for page, _ in seen) == ["1", "2", "2", "3"]
+    assert {auth for _, auth in seen} == {"Bearer token"}
+
+
+def test_download_location_async_returns_none_on_server_error(tmp_path):
+    import asyncio
+    import httpx
+
+    downloader = FloweryDownloader(output_dir=str(tmp_path))
+    downloader.bearer_token = "token"
+
+    async def fetch():
+        transport = httpx.MockTransport(lambda request: httpx.Response(500))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await downloader.download_location_async(client, asyncio.Semaphore(1), 7, "Tampa")
+
+    assert asyncio.run(fetch()) is None
+
+
+def test_location_cache_is_written_atomically_without_leftover_temp_files(tmp_path):
+    import os
+
+    downloader = FloweryDownloader(output_dir=str(tmp_path))
+    locations = [{"id": 1, "name": "Tampa"}]
+    downloader._save_cached_locations(locations)
+    downloader._save_cached_locations(locations)
+
+    assert downloader._load_cached_locations() == locations
+    assert os.listdir(downloader.flowery_dir) == ["locations_cache.json"]
@@ -0,0 +1,208 @@
+import sys
+from pathlib import Path
+
+# Ensure src/ is on sys.path for local test runs
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from terprint_menu_downloader.dispensaries.green_dragon import scraper
+
+
+def test_rate_limiter_only_waits_for_same_host(monkeypatch):
+    clock = {"now": 100.0}
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(round(seconds, 3))
+        clock["now"] += seconds
+
+    monkeypatch.setattr(scraper.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(scraper.time, "sleep", fake_sleep)
+
+    limiter = scraper._HostRateLimiter()
+    limiter.wait("https://shop.greendragon.com/avon/menu", 1.5)
+    limiter.wait("https://mete.labdrive.net/s/abc", 1.5)
+    assert sleeps == []
+
+    # Time spent on the previous request counts toward the interval
+    clock["now"] += 1.0
+    limiter.wait("https://shop.greendragon.com/avon/menu/flower-142", 1.5)
+    assert sleeps == [0.5]
+
+
+def test_rate_limit_budget_is_shared_across_threads(monkeypatch):
+    import threading
+
+    clock = {"now": 100.0}
+    sleeps = []
+    monkeypatch.setattr(scraper.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(scraper.time, "sleep", sleeps.append)
+    monkeypatch.setattr(scraper, "_rate_limiter", scraper._HostRateLimiter())
+
+    url = "https://shop.greendragon.com/avon/menu"
+    workers = [threading.Thread(target=scraper._rate_limit, args=(url, 1.5)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # Every worker after the first waits its turn on the same host budget
+    assert sorted(sleeps) == [1.5, 3.0]
+
+
+def test_extract_from_html_pairs_lab_labels_with_values():
+    html = """
+    <html><body>
+      <h1>Blue Dream 3.5g</h1>
+      <div><div class="OUIWQpt">Total THC</div><div class="zRYKXNN">22.8%</div></div>
+      <div><div class="OUIWQpt">Total CBD</div><div class="zRYKXNN">0.04%</div></div>
+      <div><div class="OUIWQpt">Strain Prevalence</div><div class="zRYKXNN">#Hybrid</div></div>
+      <a href="https://mete.labdrive.net/s/abc123">View COA</a>
+    </body></html>
+    """
+    data = scraper._extract_from_html(html)
+    assert data["name"] == "Blue Dream 3.5g"
+    assert data["thc_percent"] == 22.8
+    assert data["cbd_percent"] == 0.04
+    assert data["strain_type"] == "Hybrid"
+    assert data["coa_url"] == "https://mete.labdrive.net/s/abc123"
+
+
+def test_get_revalidates_with_etag_and_serves_304_from_cache(tmp_path, monkeypatch):
+    import httpx
+    from terprint_menu_downloader.http_cache import ResponseCache
+
+    monkeypatch.setattr(scraper, "_rate_limit", lambda *a, **k: None)
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, text="<h1>menu</h1>")
+
+    cache = ResponseCache(str(tmp_path))
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        url = "https://shop.greendragon.com/avon/menu/flower-142"
+        assert scraper._get(client, url, cache=cache) == "<h1>menu</h1>"
+        assert scraper._get(client, url, cache=cache) == "<h1>menu</h1>"
+    assert seen == [None, '"v1"']
+
+
+def test_identical_product_pages_are_parsed_once(monkeypatch):
+    calls = []
+    real = scraper._parse_product_page
+
+    def counting(html, variant_id=None):
+        calls.append(variant_id)
+        return real(html, variant_id)
+
+    monkeypatch.setattr(scraper, "_parse_product_page", counting)
+    monkeypatch.setattr(scraper, "_parse_memo", scraper._ParseMemo())
+
+    html = '<h1>Gelato 3.5g</h1><div><div class="OUIWQpt">Total THC</div><div class="zRYKXNN">25.1%</div></div>'
+    first = scraper._parse_product_page_cached(html, "42")
+    second = scraper._parse_product_page_cached(html, "42")
+    assert first == second == ("html_fallback", {"name": "Gelato 3.5g", "thc_percent": 25.1}, None)
+    assert calls == ["42"]
+
+    # A page differing only in potency is parsed on its own
+    scraper._parse_product_page_cached(html.replace("25.1", "19.4"), "42")
+    assert calls == ["42", "42"]
+
+
+def test_product_page_stream_stops_after_sw_blob_on_http2(monkeypatch):
+    import httpx
+
+    monkeypatch.setattr(scraper, "_rate_limit", lambda *a, **k: None)
+    served = []
+    chunks = [
+        b"<html><head><script>window.__sw = {\"q\":\"GetProductByVariantId\"",
+        b"};</script></head>",
+        b"<body>" + b"x" * 1000 + b"</body></html>",
+    ]
+
+    def body():
+        for chunk in chunks:
+            served.append(chunk)
+            yield chunk
+
+    def handler(request):
+        return httpx.Response(200, content=body(), extensions={"http_version": b"HTTP/2"})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        html = scraper._get(client, "https://shop.greendragon.com/p", stop_after_sw_blob=True)
+    assert html.endswith("};</script>")
+    assert len(served) == 2
+
+
+def test_scrape_store_isolates_a_failing_product_page(monkeypatch):
+    from terprint_menu_downloader.dispensaries.green_dragon.config import FL_STORES
+
+    def fake_links(client, store_slug, category, category_path, config=None):
+        return [{"product_slug": "ok-1", "product_url": "u1"}, {"product_slug": "bad-2", "product_url": "u2"}]
+
+    def fake_detail(client, product, config=None, scraped_at=None):
+        if product["product_slug"].startswith("bad"):
+            raise ValueError("could not convert string to float: 'ND'")
+        product["detail_source"] = "window.__sw"
+        return product
+
+    monkeypatch.setattr(scraper, "scrape_menu_links", fake_links)
+    monkeypatch.setattr(scraper, "scrape_product_detail", fake_detail)
+
+    result = scraper.GreenDragonStoreScraper().scrape_store(FL_STORES[0], categories={"flower": "flower-142"})
+    ok, bad = result["products"]
+    assert ok["detail_source"] == "window.__sw"
+    assert bad["detail_source"] == "none" and "ValueError" in bad["detail_error"]
+
+
+def test_truncated_product_page_is_refetched_whole_when_the_blob_does_not_parse(tmp_path, monkeypatch):
+    import dataclasses
+    import httpx
+    from terprint_menu_downloader.http_cache import ResponseCache
+
+    monkeypatch.setattr(scraper, "_rate_limit", lambda *a, **k: None)
+    monkeypatch.setattr(scraper, "_parse_memo", scraper._ParseMemo())
+    # The blob names the product query but holds no product object, so it
+    # cannot be parsed; the lab data only appears later in the page
+    page = (
+        b"<html><head><script>window.__sw = {\"q\":\"GetProductByVariantId\"};</script></head>"
+        b"<body><h1>Gelato 3.5g</h1>"
+        b"<div><div class=\"OUIWQpt\">Total THC</div><div class=\"zRYKXNN\">25.1%</div></div>"
+        b"</body></html>"
+    )
+    blob = page[:page.index(b"</script>") + len(b"</script>")]
+    validators_seen = []
+
+    def handler(request):
+        validators_seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, headers={"ETag": '"v1"'}, content=iter([page[:80], page[80:]]),
+            extensions={"http_version": b"HTTP/2"},
+        )
+
+    cache = ResponseCache(str(tmp_path))
+    monkeypatch.setattr(scraper, "_response_cache", lambda config: cache)
+    config = dataclasses.replace(scraper.GREEN_DRAGON_CONFIG, parse_processes=0)
+    url = "https://shop.greendragon.com/avon/menu/flower/gelato-42"
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        body, truncated = scraper._fetch_page(client, url, cache=cache, stop_after_sw_blob=True)
+        assert truncated and body.encode() == blob
+        # The blob is cached with its validators and revalidates like any page
+        assert cache.load(url) == blob
+        body, truncated = scraper._fetch_page(client, url, cache=cache, stop_after_sw_blob=True)
+        assert truncated and body.encode() == blob
+
+        product = scraper.scrape_product_detail(client, {"product_url": url}, config)
+
+    assert product["detail_source"] == "html_fallback"
+    assert product["thc_percent"] == 25.1
+    # The refetch skips the validators, so a 304 cannot return the blob again
+    assert validators_seen == [None, '"v1"', '"v1"', None]
+    assert cache.load(url) == page
@@ -0,0 +1,222 @@
+import sys
+from pathlib import Path
+
+# Ensure src/ is on sys.path for local test runs
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from terprint_menu_downloader.dispensaries.sanctuary import scraper
+
+
+MENU_HTML = """
+<html><body>
+  <a href="/shop/florida/orlando/menu">Menu</a>
+  <a href="/shop/florida/orlando/menu/flower-1384">Flower</a>
+  <a href="/shop/florida/orlando/menu/flower-1384/wedding-mints-164618?ref=grid">Wedding Mints</a>
+  <a href="https://sanctuarymed.com/shop/florida/orlando/product/blue-dream-440419">Blue Dream</a>
+  <a href="/shop/florida/orlando/menu/flower-1384/wedding-mints-164618">Wedding Mints (dup)</a>
+  <a href="/shop/florida/tampa/product/other-store-1">Other store</a>
+  <a href="/about-us">About</a>
+</body></html>
+"""
+
+
+def test_scrape_menu_links_extracts_store_product_links(monkeypatch):
+    monkeypatch.setattr(scraper, "_get", lambda client, url, rate_limit=1.5: MENU_HTML)
+
+    products = scraper.scrape_menu_links(None, "orlando", "flower", "flower-1384")
+
+    assert [(p["product_slug"], p["sweed_product_id"]) for p in products] == [
+        ("wedding-mints-164618", "164618"),
+        ("blue-dream-440419", "440419"),
+    ]
+    assert products[0]["product_url"] == (
+        "https://sanctuarymed.com/shop/florida/orlando/menu/flower-1384/wedding-mints-164618"
+    )
+    assert products[1]["product_url"] == (
+        "https://sanctuarymed.com/shop/florida/orlando/product/blue-dream-440419"
+    )
+
+
+def test_scrape_store_fetches_details_concurrently_within_limit(monkeypatch):
+    import asyncio
+    from terprint_menu_downloader.dispensaries.sanctuary.config import FL_STORES, SanctuaryConfig
+
+    async def fake_links(client, store_slug, category, category_path, config=None, limiter=None):
+        return [{"product_slug": f"p-{i}", "product_url": f"u{i}"} for i in range(10)]
+
+    in_flight = {"now": 0, "max": 0}
+
+    async def fake_detail(client, product, config=None, limiter=None, scraped_at=None):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if product["product_slug"] == "p-3":
+            raise ValueError("bad page")
+        product["detail_source"] = "window.__sw_qc"
+        return product
+
+    monkeypatch.setattr(scraper, "scrape_menu_links_async", fake_links)
+    monkeypatch.setattr(scraper, "scrape_product_detail_async", fake_detail)
+
+    config = SanctuaryConfig(rate_limit_sec=0, concurrent_requests=3)
+    result = scraper.SanctuaryStoreScraper(config).scrape_store(
+        FL_STORES[0], categories={"flower": "flower-1384"}, max_products=8
+    )
+
+    products = result["products"]
+    assert len(products) == 10
+    assert in_flight["max"] == 3
+    assert [p.get("detail_source") for p in products] == ["window.__sw_qc"] * 3 + ["none"] + ["window.__sw_qc"] * 4 + [None] * 2
+    assert "ValueError" in products[3]["detail_error"]
+
+
+def test_extract_from_sw_blob_reads_product_query():
+    html = (
+        '<script>window.__sw_qc = {"queries": ['
+        '{"queryHash": "[\\"/Products/GetCategories\\"]", "state": {"data": []}},'
+        '{"queryHash": "[\\"/Products/GetProductByVariantId\\",{\\"variantId\\":\\"164618\\"}]",'
+        ' "state": {"data": {"id": 119920, "name": "Wedding Mints {Indoor}",'
+        ' "variants": [{"id": 164618, "labTests": {"thc": {"value": [29.5]}}}]}}}'
+        ']};</script><p>}</p>'
+    )
+    data = scraper._extract_from_sw_blob(html, "164618")
+    assert data["name"] == "Wedding Mints {Indoor}"
+    assert data["variant_id"] == "164618"
+    assert data["thc_percent"] == 29.5
+
+
+def test_scrape_store_fetches_products_listed_in_several_categories_once(monkeypatch):
+    from terprint_menu_downloader.dispensaries.sanctuary.config import FL_STORES, SanctuaryConfig
+
+    menus = {
+        "flower": ["a-1", "b-2"],
+        "pre-rolls": ["b-2", "c-3"],
+    }
+
+    async def fake_links(client, store_slug, category, category_path, config=None, limiter=None):
+        return [{"product_slug": slug, "product_url": f"https://x/{slug}", "category": category} for slug in menus[category]]
+
+    fetched = []
+
+    async def fake_detail(client, product, config=None, limiter=None, scraped_at=None):
+        fetched.append(product["product_slug"])
+        return product
+
+    monkeypatch.setattr(scraper, "scrape_menu_links_async", fake_links)
+    monkeypatch.setattr(scraper, "scrape_product_detail_async", fake_detail)
+
+    result = scraper.SanctuaryStoreScraper(SanctuaryConfig(rate_limit_sec=0)).scrape_store(
+        FL_STORES[0], categories={"flower": "flower-1384", "pre-rolls": "pre-rolls-1385"}
+    )
+
+    assert sorted(fetched) == ["a-1", "b-2", "c-3"]
+    assert [(p["product_slug"], p["categories"]) for p in result["products"]] == [
+        ("a-1", ["flower"]),
+        ("b-2", ["flower", "pre-rolls"]),
+        ("c-3", ["pre-rolls"]),
+    ]
+
+
+def test_extract_from_html_pairs_lab_labels_with_values():
+    html = """
+    <html><body>
+      <h1>Wedding Mints</h1>
+      <div><div class="OUIWQpt">Total THC</div><div class="zRYKXNN">29.5%</div></div>
+      <div><div class="OUIWQpt">Total Terpenes</div><div class="zRYKXNN">2.1%</div></div>
+      <div><div class="OUIWQpt">Strain Prevalence</div><div class="zRYKXNN">#Indica</div></div>
+      <div><div class="OUIWQpt">Strain</div><div class="zRYKXNN">#Wedding Cake</div></div>
+      <div><div class="OUIWQpt">Harvest Date</div><div class="zRYKXNN">2026-01-02</div></div>
+      <a href="/coa/164618.pdf">COA  Lab Report Link</a>
+    </body></html>
+    """
+    assert scraper._extract_from_html(html) == {
+        "name": "Wedding Mints",
+        "thc_percent": 29.5,
+        "total_terpenes_pct": 2.1,
+        "strain_type": "Indica",
+        "strain_name": "Wedding Cake",
+        "coa_url": "https://sanctuarymed.com/coa/164618.pdf",
+    }
+
+
+def test_product_page_stream_stops_after_sw_qc_blob_on_http2():
+    import asyncio
+    import httpx
+
+    served = []
+    chunks = [
+        b"<html><head><script>window.__sw_qc = {\"queries\":[{\"queryHash\":\"GetProductByVariantId\"",
+        b"}]};</script></head>",
+        b"<body>" + b"x" * 1000 + b"</body></html>",
+    ]
+
+    async def body():
+        for chunk in chunks:
+            served.append(chunk)
+            yield chunk
+
+    def handler(request):
+        return httpx.Response(200, content=body(), extensions={"http_version": b"HTTP/2"})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await scraper._aget(client, "https://sanctuarymed.com/p", stop_after_sw_blob=True)
+
+    html = asyncio.run(fetch())
+    assert html.endswith("}]};</script>")
+    assert len(served) == 2
+
+
+def test_stub_product_page_skips_parsing(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("stub page should not be parsed")
+
+    monkeypatch.setattr(scraper, "_extract_from_sw_blob", fail)
+    monkeypatch.setattr(scraper, "_extract_from_html", fail)
+
+    product = scraper._apply_product_detail(
+        {"product_slug": "gone-1"}, "<html><h1>Product unavailable</h1></html>", scraped_at="t"
+    )
+    assert product == {"product_slug": "gone-1", "detail_source": "none", "detail_scraped_at": "t"}
+
+
+def test_truncated_product_page_is_refetched_whole_when_blob_fails_to_parse():
+    import asyncio
+    import httpx
+
+    # The blob names the product query but holds no product object; the lab
+    # data only appears later in the page
+    page = (
+        b"<html><head><script>window.__sw_qc = {\"queries\":[{\"queryHash\":\"GetProductByVariantId\"}]};"
+        b"</script></head><body><h1>Wedding Mints 3.5g</h1>"
+        b"<div><div class=\"OUIWQpt\">Total THC</div><div class=\"zRYKXNN\">29.5%</div></div>"
+        b"</body></html>"
+    )
+    requests_seen = []
+
+    async def body():
+        yield page[:90]
+        yield page[90:]
+
+    def handler(request):
+        requests_seen.append(request.url.path)
+        return httpx.Response(200, content=body(), extensions={"http_version": b"HTTP/2"})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            html, truncated = await scraper._afetch_page(
+                client, "https://sanctuarymed.com/p", stop_after_sw_blob=True
+            )
+            assert truncated and html.endswith("}]};</script>")
+            return await scraper.scrape_product_detail_async(
+                client, {"product_url": "https://sanctuarymed.com/p"}, scraped_at="t"
+            )
+
+    product = asyncio.run(fetch())
+    assert product["detail_source"] == "html_fallback"
+    assert product["thc_percent"] == 29.5
+    assert len(requests_seen) == 3